@@ -1,10 +1,28 @@
+import sys
+
 from nextcord import Intents, Game
 from nextcord.ext.commands import Bot
 
 from src.commands import QuizCog
+from src.config import ConfigurationManager as cm
+from src.data.compiler import DataCompiler
+from src.paths import DATA_BUNDLE_PATH
+
+
+def compile_data():
+    data_compiler = DataCompiler(langs_data=cm.LANGS_DATA)
+    bundle = data_compiler.compile()
+    data_compiler.save(bundle)
+
+    total_questions = len(bundle[DataCompiler.QUESTIONS])
+    print(f"{total_questions} questions written to {DATA_BUNDLE_PATH}.")
 
 
 if __name__ == "__main__":
+    if sys.argv[1:] == ["compile-data"]:
+        compile_data()
+        sys.exit()
+
     GOD_ID = 413429373996367872
     ACTIVITY = Game(name="/quiz")
 
@@ -16,6 +34,11 @@ if __name__ == "__main__":
     intents.members = True
 
     bot = Bot(intents=intents, activity=ACTIVITY, owner_id=GOD_ID)
-    bot.add_cog(QuizCog(bot))
+    quiz_cog = QuizCog(bot)
+    bot.add_cog(quiz_cog)
 
-    bot.run(token)
+    # SIGTERM stops the loop of bot.run, which then returns normally.
+    try:
+        bot.run(token)
+    finally:
+        quiz_cog.close()
@@ -0,0 +1,170 @@
+from collections import Counter
+
+import numpy as np
+
+# Every rapidfuzz module goes through rapidfuzz._utils, which imports pandas when
+# it is installed (about 0.35s of the 1.15s taken by "import src.commands").
+from rapidfuzz import fuzz, process
+
+
+class MatcherStats:
+    def __init__(self):
+        self.checked = 0
+        self.rejected_strict = 0
+        self.rejected_by_length = 0
+        self.rejected_by_histogram = 0
+
+    @property
+    def short_circuited(self):
+        return (
+            self.rejected_strict + self.rejected_by_length + self.rejected_by_histogram
+        )
+
+    def display(self):
+        return (
+            f"{self.short_circuited}/{self.checked} messages rejected before scoring "
+            f"(strict: {self.rejected_strict}, length: {self.rejected_by_length}, "
+            f"histogram: {self.rejected_by_histogram})"
+        )
+
+
+class AnswerMatcher:
+    # Scores are rounded to the nearest integer before being compared to the
+    # threshold (like fuzzywuzzy did), so threshold - 0.5 can still be accepted.
+    ROUNDING_MARGIN = 0.5
+    EXACT_THRESHOLD = 100
+    # Below this total length, two different strings can't reach a rounded
+    # ratio of 100: 100 * (1 - 1 / length) < 99.5.
+    EXACT_MIN_FUZZY_LENGTH = 200
+
+    def __init__(
+        self,
+        formatted_answers: list[str],
+        answer_formatter,
+        fuzz_threshold: int,
+        stats: MatcherStats = None,
+    ):
+        self.answer_formatter = answer_formatter
+        self.fuzz_threshold = fuzz_threshold
+        self.stats = stats if stats is not None else MatcherStats()
+        self.formatted_answers = list(dict.fromkeys(formatted_answers))
+        self._answers_set = frozenset(self.formatted_answers)
+        self._answers_histogram = [
+            (answer, len(answer), Counter(answer)) for answer in self.formatted_answers
+        ]
+        self._score_cutoff = fuzz_threshold - self.ROUNDING_MARGIN
+        self._max_answer_length = max(map(len, self.formatted_answers), default=0)
+        self._is_strict = fuzz_threshold >= self.EXACT_THRESHOLD
+
+    def _is_accepted_score(self, score: float):
+        return round(score) >= self.fuzz_threshold
+
+    def _can_fuzzy_match(self, formatted_user_answer: str):
+        if not self._is_strict:
+            return True
+
+        return (
+            len(formatted_user_answer) + self._max_answer_length
+            >= self.EXACT_MIN_FUZZY_LENGTH
+        )
+
+    def _is_reachable(self, min_distance: int, total_length: int):
+        # The ratio is 100 * (1 - distance / total_length), written with integers
+        # to compare it to the score cutoff (threshold - 0.5) without rounding.
+        return 200 * min_distance <= total_length * (201 - 2 * self.fuzz_threshold)
+
+    def _prefilter(self, formatted_user_answer: str) -> list[str]:
+        length = len(formatted_user_answer)
+        candidates = [
+            (answer, answer_length, histogram)
+            for answer, answer_length, histogram in self._answers_histogram
+            if self._is_reachable(abs(length - answer_length), length + answer_length)
+        ]
+
+        if not candidates:
+            self.stats.rejected_by_length += 1
+            return []
+
+        user_histogram = Counter(formatted_user_answer)
+        candidates = [
+            answer
+            for answer, answer_length, histogram in candidates
+            if self._is_reachable(
+                length + answer_length - 2 * sum((user_histogram & histogram).values()),
+                length + answer_length,
+            )
+        ]
+
+        if not candidates:
+            self.stats.rejected_by_histogram += 1
+
+        return candidates
+
+    def best_score(
+        self, formatted_user_answer: str, answers: list[str] = None
+    ) -> float | None:
+        best_match = process.extractOne(
+            formatted_user_answer,
+            self.formatted_answers if answers is None else answers,
+            scorer=fuzz.ratio,
+            score_cutoff=self._score_cutoff,
+        )
+
+        if best_match is None:
+            return None
+
+        return best_match[1]
+
+    def is_formatted_match(self, formatted_user_answer: str):
+        self.stats.checked += 1
+
+        if formatted_user_answer in self._answers_set:
+            return True
+
+        if not self._can_fuzzy_match(formatted_user_answer):
+            self.stats.rejected_strict += 1
+            return False
+
+        candidates = self._prefilter(formatted_user_answer)
+
+        if not candidates:
+            return False
+
+        score = self.best_score(formatted_user_answer, candidates)
+
+        return score is not None and self._is_accepted_score(score)
+
+    def match_many(self, formatted_user_answers: list[str]) -> list[bool]:
+        matches = [False] * len(formatted_user_answers)
+        indexes_to_score = []
+
+        for index, formatted_user_answer in enumerate(formatted_user_answers):
+            self.stats.checked += 1
+
+            if formatted_user_answer in self._answers_set:
+                matches[index] = True
+
+            elif not self._can_fuzzy_match(formatted_user_answer):
+                self.stats.rejected_strict += 1
+
+            elif self._prefilter(formatted_user_answer):
+                indexes_to_score.append(index)
+
+        if not indexes_to_score:
+            return matches
+
+        scores = process.cdist(
+            [formatted_user_answers[index] for index in indexes_to_score],
+            self.formatted_answers,
+            scorer=fuzz.ratio,
+            score_cutoff=self._score_cutoff,
+            dtype=np.float64,
+        )
+
+        for index, best_score in zip(indexes_to_score, scores.max(axis=1)):
+            matches[index] = self._is_accepted_score(best_score)
+
+        return matches
+
+    def is_match(self, user_answer: str):
+        return self.is_formatted_match(self.answer_formatter(user_answer))
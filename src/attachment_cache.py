@@ -0,0 +1,111 @@
+from io import BytesIO
+import time
+from urllib.parse import parse_qs, urlparse
+
+import nextcord
+
+from src.config import ConfigurationManager as cm
+from src.dispatcher import OutboundDispatcher
+
+
+class DiscordUploader:
+    def __init__(self, dispatcher: OutboundDispatcher):
+        self.dispatcher = dispatcher
+
+    async def upload(
+        self,
+        channel: nextcord.abc.Messageable,
+        embed: nextcord.Embed,
+        image: bytes,
+        file_name: str,
+    ) -> nextcord.Message:
+        image_file = nextcord.File(BytesIO(image), filename=file_name)
+
+        return await self.dispatcher.send(
+            channel, OutboundDispatcher.QUESTION, embed=embed, file=image_file
+        )
+
+    async def send(
+        self, channel: nextcord.abc.Messageable, embed: nextcord.Embed
+    ) -> nextcord.Message:
+        return await self.dispatcher.send(
+            channel, OutboundDispatcher.QUESTION, embed=embed
+        )
+
+
+class AttachmentCache:
+    # Discord CDN links carry their expiry as an hexadecimal timestamp.
+    EXPIRY_PARAMETER = "ex"
+    DEFAULT_LIFETIME = 12 * 3600
+    EXPIRY_MARGIN = 3600
+
+    def __init__(self, uploader: DiscordUploader, clock=time.time):
+        self.uploader = uploader
+        self.clock = clock
+        self._urls: dict[str, tuple[str, float]] = {}
+
+    def _get_expiry(self, url: str):
+        expiry = parse_qs(urlparse(url).query).get(self.EXPIRY_PARAMETER)
+
+        if expiry:
+            try:
+                return int(expiry[0], 16)
+            except ValueError:
+                pass
+
+        return self.clock() + self.DEFAULT_LIFETIME
+
+    def _get_uploaded_url(self, message: nextcord.Message):
+        if message.attachments:
+            return message.attachments[0].url
+
+        if message.embeds and message.embeds[0].image.url:
+            return message.embeds[0].image.url
+
+        return None
+
+    def add(self, image_key: str, url: str):
+        self._urls[image_key] = (url, self._get_expiry(url))
+
+    def get_url(self, image_key: str):
+        if image_key not in self._urls:
+            return None
+
+        url, expiry = self._urls[image_key]
+
+        if self.clock() >= expiry - self.EXPIRY_MARGIN:
+            del self._urls[image_key]
+            return None
+
+        return url
+
+    def invalidate(self, image_key: str):
+        self._urls.pop(image_key, None)
+
+    async def send_image(
+        self,
+        channel: nextcord.abc.Messageable,
+        embed: nextcord.Embed,
+        image_path: str,
+        load_image,
+    ) -> nextcord.Message:
+        url = self.get_url(image_path)
+
+        if url is not None:
+            embed.set_image(url=url)
+
+            try:
+                return await self.uploader.send(channel, embed)
+            except nextcord.HTTPException:
+                self.invalidate(image_path)
+
+        file_name = cm.get_file_name(image_path)
+        embed.set_image(url=f"attachment://{file_name}")
+        image = await load_image(image_path)
+        message = await self.uploader.upload(channel, embed, image, file_name)
+        uploaded_url = self._get_uploaded_url(message)
+
+        if uploaded_url is not None:
+            self.add(image_path, uploaded_url)
+
+        return message
@@ -1,11 +1,17 @@
 import asyncio
 from datetime import timedelta
+from io import BytesIO
+import json
 import os
 
 import nextcord
 from nextcord.ext.commands import Bot, Cog
-from nextcord.ext import tasks
 
+from src.attachment_cache import AttachmentCache, DiscordUploader
+from src.countdown import Countdown, CountdownTicker
+from src.dispatcher import OutboundDispatcher
+from src.leaderboard_cache import LeaderboardCache
+from src.persistence import PersistenceService
 from src.widgets import DropDown, RegistrationButton
 from src.quiz_manager import Quiz, QuizManager, Question, EloManager
 from src.config import ConfigurationManager as cm
@@ -14,10 +20,29 @@ from src.utils.utils import get_current_time
 
 
 class QuizCog(Cog):
+    NEXT_QUESTION_MESSAGE = "Next question in {remaining_time} second{plural}."
+
     def __init__(self, bot: Bot):
         self.bot = bot
-        self.quiz_manager = QuizManager()
-        self.elo_manager = EloManager()
+        self.persistence = PersistenceService(cm.PERSISTENCE_DELAY)
+        self.quiz_manager = QuizManager(self.persistence)
+        self.elo_manager = EloManager(self.persistence)
+        self.dispatcher = OutboundDispatcher()
+        self.countdown_ticker = CountdownTicker(self.dispatcher)
+        self.attachment_cache = AttachmentCache(DiscordUploader(self.dispatcher))
+        self.leaderboard_cache = LeaderboardCache(cm.LEADERBOARD_CACHE_SIZE)
+
+    def close(self):
+        self.persistence.close()
+        self.elo_manager.close()
+        self.quiz_manager.close()
+
+    @Cog.listener()
+    async def on_message(self, message: nextcord.Message):
+        quiz = self.quiz_manager.quizzes_in_progress.get(message.channel.id)
+
+        if quiz is not None and message.author != self.bot.user:
+            quiz.add_message(message)
 
     @nextcord.slash_command(name="quiz")
     async def quiz(self, _):
@@ -76,9 +101,7 @@ class QuizCog(Cog):
         if not quiz.is_running:
             return
 
-        questions = quiz.get_questions()
-
-        for question_index, question in enumerate(questions):
+        for question_index, question in enumerate(quiz.get_questions()):
             if not quiz.is_running:
                 return
 
@@ -86,7 +109,13 @@ class QuizCog(Cog):
                 channel, quiz, question_index, question, number_of_question
             )
 
+            next_image_path = quiz.get_image_path(question_index + 1)
+
+            if next_image_path is not None:
+                self.prefetch_image(quiz, next_image_path)
+
             quiz.waiting_for_answer = True
+            quiz.start_hint_timer(question)
 
             while quiz.waiting_for_answer:
                 await self.wait_for_answer(channel, quiz, question)
@@ -99,11 +128,30 @@ class QuizCog(Cog):
             )
 
             if question_index + 1 != number_of_question and quiz.is_running:
-                await quiz.next_question_timer.start(answer_message, answer_embed)
+                if cm.PREPARE_NEXT_QUESTION:
+                    # Runs once the countdown is waiting for its first tick.
+                    asyncio.get_running_loop().call_soon(
+                        quiz.prepare_question, question_index + 1
+                    )
+
+                await self.countdown_ticker.run(
+                    Countdown(
+                        message=answer_message,
+                        embed=answer_embed,
+                        duration=cm.TIME_BETWEEN_QUESTION,
+                        footer=self.NEXT_QUESTION_MESSAGE,
+                        is_running=lambda: quiz.is_running,
+                        on_finish=self.remove_countdown_footer,
+                    )
+                )
 
         if quiz.is_running:
             await asyncio.sleep(cm.TIME_BETWEEN_QUESTION)
-            await channel.send("The quiz is over, thanks for playing!")
+            await self.dispatcher.send(
+                channel,
+                OutboundDispatcher.QUESTION,
+                content="The quiz is over, thanks for playing!",
+            )
             await self.show_leaderboard(channel, quiz)
             self.quiz_manager.end_quiz(channel.id)
 
@@ -133,24 +181,34 @@ class QuizCog(Cog):
             )
             registration_button = RegistrationButton(
                 elo_manager=self.elo_manager,
+                countdown_ticker=self.countdown_ticker,
                 quiz=quiz,
                 embed=embed,
                 registration_time=cm.REGISTRATION_TIME,
             )
-            message = await interaction.send(embed=embed, view=registration_button)
+            message = await self.dispatcher.followup(
+                interaction,
+                OutboundDispatcher.QUESTION,
+                embed=embed,
+                view=registration_button,
+            )
             await registration_button.update(message)
 
             if not quiz.is_running:
                 return
 
             if not quiz.allowed_players:
-                await channel.send(
-                    "There are not registered players, the quiz is canceled."
+                await self.dispatcher.send(
+                    channel,
+                    OutboundDispatcher.QUESTION,
+                    content="There are not registered players, the quiz is canceled.",
                 )
                 self.quiz_manager.end_quiz(channel.id)
                 return
         else:
-            await interaction.send(embed=embed)
+            await self.dispatcher.followup(
+                interaction, OutboundDispatcher.QUESTION, embed=embed
+            )
 
     async def ask_question(
         self,
@@ -165,40 +223,48 @@ class QuizCog(Cog):
             description=f"What is the name of this?",
             color=0x7AFF33,
         )
-        image = nextcord.File(question.image_path, filename=cm.FILE_NAME)
-        embed.set_image(url=f"attachment://{cm.FILE_NAME}")
-
         if quiz.is_ranked:
             embed.set_footer(text="Only registered players can participate.")
 
-        message = await channel.send(embed=embed, file=image)
+        message = await self.attachment_cache.send_image(
+            channel, embed, question.image_path, quiz.get_image
+        )
         question.add_first_message(message)
 
-    async def get_close_answers(
+    def prefetch_image(self, quiz: Quiz, image_path: str):
+        if self.attachment_cache.get_url(image_path) is None:
+            quiz.prefetch_image(image_path)
+
+    def get_close_answers(
         self,
-        channel: nextcord.TextChannel,
+        quiz: Quiz,
         question: Question,
         first_message_timestamp: float,
         winner_message: nextcord.Message,
         winner_time: float,
+        other_winners: list[nextcord.Message],
+        last_checked_message: nextcord.Message,
     ):
         close_answers = [[winner_message.author.display_name, winner_time, 0]]
+        close_answer_limit = winner_message.created_at + timedelta(seconds=1)
+        close_messages = [
+            message
+            for message in other_winners
+            if message.created_at < close_answer_limit
+        ]
+        close_messages += question.find_winners(
+            quiz.get_recent_messages(last_checked_message, close_answer_limit)
+        )
 
-        async for message in channel.history(
-            limit=None,
-            after=winner_message,
-            before=winner_message.created_at + timedelta(seconds=1),
-            oldest_first=True,
-        ):
-            if question.is_winner(message.content, message.author.id):
-                answer_time = message.created_at.timestamp() - first_message_timestamp
-                close_answers.append(
-                    [
-                        message.author.display_name,
-                        answer_time,
-                        answer_time - winner_time,
-                    ]
-                )
+        for message in close_messages:
+            answer_time = message.created_at.timestamp() - first_message_timestamp
+            close_answers.append(
+                [
+                    message.author.display_name,
+                    answer_time,
+                    answer_time - winner_time,
+                ]
+            )
 
         return close_answers
 
@@ -216,7 +282,7 @@ class QuizCog(Cog):
             ),
             color=0xFF5733,
         )
-        await channel.send(embed=embed)
+        await self.dispatcher.send(channel, OutboundDispatcher.QUESTION, embed=embed)
 
     async def wait_for_close_answers(self, winner_message: nextcord.Message):
         elapsed_time = (get_current_time() - winner_message.created_at).total_seconds()
@@ -230,44 +296,54 @@ class QuizCog(Cog):
         quiz: Quiz,
         question: Question,
     ):
-        await asyncio.sleep(cm.CHECK_ANSWER_PERIOD)
-        message = question.last_message
+        messages = await quiz.get_new_messages(question.last_message)
 
         if not quiz.is_running:
             return
 
-        async for message in channel.history(
-            limit=None, after=message, oldest_first=True
-        ):
-            if question.is_winner(message.content, message.author.id):
-                quiz.waiting_for_answer = False
+        message, other_winners = question.find_first_winner(messages)
 
-                first_message_timestamp = question.first_message_timestamp
-                answer_time = message.created_at.timestamp() - first_message_timestamp
+        if message is not None:
+            quiz.waiting_for_answer = False
+            quiz.cancel_hint_timer()
 
-                await message.reply(
-                    f"Good game! You answered in {answer_time:.3f} seconds."
-                )
-                quiz.increment_score(player=message.author)
+            first_message_timestamp = question.first_message_timestamp
+            answer_time = message.created_at.timestamp() - first_message_timestamp
+
+            await self.dispatcher.reply(
+                message,
+                OutboundDispatcher.QUESTION,
+                f"Good game! You answered in {answer_time:.3f} seconds.",
+            )
+            quiz.increment_score(player=message.author)
+
+            await self.wait_for_close_answers(message)
+            close_answers = self.get_close_answers(
+                quiz,
+                question,
+                first_message_timestamp,
+                message,
+                answer_time,
+                other_winners,
+                messages[-1],
+            )
+            await self.show_close_answers(channel, close_answers)
 
-                await self.wait_for_close_answers(message)
-                close_answers = await self.get_close_answers(
-                    channel,
-                    question,
-                    first_message_timestamp,
-                    message,
-                    answer_time,
-                )
-                await self.show_close_answers(channel, close_answers)
-                break
         else:
-            question.last_message = message
+            if messages:
+                question.last_message = messages[-1]
 
-            if not question.show_hint() or not quiz.waiting_for_answer:
+            if not quiz.waiting_for_answer:
+                return
+
+            if not question.show_hint():
+                # The loop can run timers up to its clock resolution early.
+                quiz.start_hint_timer(question)
                 return
 
             if question.under_hint_limit():
                 question.get_hints()
+                quiz.start_hint_timer(question)
                 embed = nextcord.Embed(
                     title=f"Hint {question.hint_shown} of {quiz.max_hint}",
                     description="\n".join(
@@ -279,15 +355,21 @@ class QuizCog(Cog):
 
                 last_hint_message: nextcord.Message = question.last_hint_message
 
-                new_hint_message = await channel.send(embed=embed)
+                new_hint_message = await self.dispatcher.send(
+                    channel, OutboundDispatcher.HINT, embed=embed
+                )
                 question.last_hint_message = new_hint_message
 
                 if last_hint_message is not None:
-                    await last_hint_message.delete()
+                    await self.dispatcher.delete(
+                        last_hint_message, OutboundDispatcher.HINT
+                    )
 
             else:
                 quiz.waiting_for_answer = False
-                await channel.send(f"Too late!")
+                await self.dispatcher.send(
+                    channel, OutboundDispatcher.QUESTION, content=f"Too late!"
+                )
 
     async def show_answer(
         self, interaction: nextcord.Interaction, quiz: Quiz, question: Question
@@ -300,30 +382,16 @@ class QuizCog(Cog):
             ),
             color=0x5E296B,
         )
-        message = await interaction.send(embed=embed)
-
-        return message, embed
-
-    @tasks.loop(seconds=1)
-    async def next_question_timer(
-        self, quiz: Quiz, message: nextcord.Message, embed: nextcord.Embed
-    ):
-        remaining_time = (
-            cm.TIME_BETWEEN_QUESTION - self.next_question_timer.current_loop
+        message = await self.dispatcher.send(
+            interaction, OutboundDispatcher.QUESTION, embed=embed
         )
-        plural = "s" * (remaining_time >= 2)
-        embed.set_footer(text=f"Next question in {remaining_time} second{plural}.")
 
-        if not quiz.is_running:
-            embed.remove_footer()
-            self.next_question_timer.stop()
-
-        await message.edit(embed=embed)
+        return message, embed
 
-        if not remaining_time:
-            self.next_question_timer.stop()
-            embed.remove_footer()
-            await message.edit(embed=embed)
+    @staticmethod
+    async def remove_countdown_footer(countdown: Countdown):
+        countdown.embed.remove_footer()
+        await countdown.edit()
 
     async def show_leaderboard(self, interaction: nextcord.Interaction, quiz: Quiz):
         if quiz.is_ranked:
@@ -342,11 +410,9 @@ class QuizCog(Cog):
 
             embed.set_thumbnail(winner.avatar)
 
-        await interaction.send(embed=embed)
-
-    @staticmethod
-    def get_member(guild: nextcord.Guild, user_name: str):
-        return nextcord.utils.get(guild.members, name=user_name)
+        await self.dispatcher.send(
+            interaction, OutboundDispatcher.QUESTION, embed=embed
+        )
 
     @quiz.subcommand(name="stop")
     async def stop_quiz(self, interaction: nextcord.Interaction):
@@ -371,7 +437,7 @@ class QuizCog(Cog):
             await interaction.send("There are no questions in progress.")
             return
 
-        quiz.waiting_for_answer = False
+        quiz.cancel_question()
         await interaction.send("The question was canceled.")
 
     @quiz.subcommand(name="ranking")
@@ -390,7 +456,7 @@ class QuizCog(Cog):
 
         try:
             player_ranking = self.elo_manager.get_player_ranking(
-                interaction.guild.id, member.name
+                interaction.guild.id, member.id
             )
 
             if player_ranking is None:
@@ -419,38 +485,52 @@ class QuizCog(Cog):
         interaction: nextcord.Interaction,
     ):
         """Show elo leaderboard."""
-        try:
-            leaderboard = self.elo_manager.get_leaderboard(interaction.guild_id)
+        guild_id = interaction.guild_id
+        version = self.elo_manager.get_version(guild_id)
+        leaderboard = self.leaderboard_cache.get(guild_id, version)
 
-        except KeyError:
-            await interaction.send("There are no leaderboard on this server yet.")
+        if leaderboard is None:
+            try:
+                leaderboard = self.elo_manager.get_leaderboard(guild_id)
 
-        else:
-            embed = nextcord.Embed(title="Elo leaderboard 🏆", color=0x33A5FF)
-            winner = next(leaderboard, None)
+            except KeyError:
+                await interaction.send("There are no leaderboard on this server yet.")
+                return
+
+            self.leaderboard_cache.put(guild_id, version, leaderboard)
+
+        # Members are resolved each time so that renames and new avatars show up.
+        description, thumbnail_url = self.render_elo_leaderboard(
+            interaction.guild, leaderboard
+        )
+        embed = nextcord.Embed(
+            title="Elo leaderboard 🏆", description=description, color=0x33A5FF
+        )
 
-            if winner is not None:
-                member = self.get_member(interaction.guild, winner[1])
+        if thumbnail_url is not None:
+            embed.set_thumbnail(thumbnail_url)
 
-                if member is not None:
-                    embed.set_thumbnail(member.display_avatar)
-                    winner_name = member.display_name
+        await interaction.send(embed=embed)
 
-                else:
-                    winner_name = winner[1]
+    @staticmethod
+    def render_elo_leaderboard(guild: nextcord.Guild, leaderboard: list[tuple]):
+        lines = []
+        thumbnail_url = None
 
-                embed.description = f"{winner[0]} ┊ **{winner_name}** ({winner[2]})\n"
+        for rank, player_id, player_name, elo in leaderboard:
+            member = guild.get_member(player_id)
 
-                for player in leaderboard:
-                    member = self.get_member(interaction.guild, player[1])
-                    member_name = (
-                        member.display_name if member is not None else player[1]
-                    )
-                    embed.description += (
-                        f"{player[0]} ┊ **{member_name}** ({player[2]})\n"
-                    )
+            if member is not None:
+                player_name = member.display_name
 
-            await interaction.send(embed=embed)
+                if not lines:
+                    thumbnail_url = member.display_avatar.url
+
+            lines.append(f"{rank} ┊ **{player_name}** ({elo})")
+
+        description = "\n".join(lines) + "\n" if lines else None
+
+        return description, thumbnail_url
 
     @quiz.subcommand(name="info")
     async def show_quiz_info(
@@ -535,6 +615,11 @@ class QuizCog(Cog):
                     for guild in self.bot.guilds
                 ),
             )
+            embed.add_field(
+                name="Answer prefilter",
+                value=self.quiz_manager.matcher_stats.display(),
+                inline=False,
+            )
             await interaction.send(embed=embed, ephemeral=True)
         else:
             await interaction.send("You can't use this command.", ephemeral=True)
@@ -555,6 +640,12 @@ class QuizCog(Cog):
         else:
             await interaction.send("You can't use this command.", ephemeral=True)
 
+    @staticmethod
+    def get_json_file(path: str, data: dict):
+        content = json.dumps(data, indent=4).encode()
+
+        return nextcord.File(BytesIO(content), filename=os.path.basename(path))
+
     @nextcord.slash_command(name="files")
     async def get_files(
         self,
@@ -562,23 +653,16 @@ class QuizCog(Cog):
     ):
         """Get leaderboard and langs files."""
         if interaction.user.id == self.bot.owner_id:
-            files_to_send = []
-
-            if os.path.exists(LEADERBOARD_PATH):
-                files_to_send.append(nextcord.File(LEADERBOARD_PATH))
-            else:
-                await interaction.send(
-                    f"The file {LEADERBOARD_PATH} doesn't exist.", ephemeral=True
-                )
-
-            if os.path.exists(LANGS_BY_SERVERS_PATH):
-                files_to_send.append(nextcord.File(LANGS_BY_SERVERS_PATH))
-            else:
-                await interaction.send(
-                    f"The file {LANGS_BY_SERVERS_PATH} doesn't exist.", ephemeral=True
-                )
-
-            if files_to_send:
-                await interaction.send(files=files_to_send, ephemeral=True)
+            # Pending changes may not be on disk yet, send the current state.
+            files_to_send = [
+                self.get_json_file(
+                    LEADERBOARD_PATH, self.elo_manager.export_leaderboard()
+                ),
+                self.get_json_file(
+                    LANGS_BY_SERVERS_PATH,
+                    self.quiz_manager.config_manager.langs_by_servers,
+                ),
+            ]
+            await interaction.send(files=files_to_send, ephemeral=True)
         else:
             await interaction.send("You can't use this command.", ephemeral=True)
@@ -1,17 +1,28 @@
-import json
+import os
 
 from unidecode import unidecode
 
-from src.paths import CONFIG_PATH, LANGS_BY_SERVERS_PATH, LANGS_DATA_PATH
+from src.journal import Journal
+from src.persistence import PersistenceService
+from src.paths import (
+    CONFIG_PATH,
+    LANGS_BY_SERVERS_JOURNAL_PATH,
+    LANGS_BY_SERVERS_PATH,
+    LANGS_DATA_PATH,
+)
 from src.utils.utils import open_json
 
 
 class ConfigurationManager:
-    CHECK_ANSWER_PERIOD = 1
     REGISTRATION_TIME = 30
     CHANGE_LANG_TIME = 30
     CLOSE_ANSWSER_MAX_SECOND = 1
+    RECENT_MESSAGES_SIZE = 100
     TIME_BETWEEN_QUESTION = 10
+    PREPARE_NEXT_QUESTION = True
+    PERSISTENCE_DELAY = 5
+    LEADERBOARD_CACHE_SIZE = 256
+    DECK_RESET_FRACTION = 0.8
 
     NUMBER_OF_QUESTION = [5, 10, 20, 40]
     FRIENDYLY = "friendly"
@@ -32,6 +43,7 @@ class ConfigurationManager:
 
     DEFAULT_LANG = "fr"
     EMOJI = "emoji"
+    LANG_UNLOAD_TIME = 6 * 3600
 
     FUZZ_THRESHOLD = {
         STRICT: 100,
@@ -46,11 +58,34 @@ class ConfigurationManager:
     IS_MONSTER = "is_monster"
     IMAGE_NAME1 = "image_name1"
     IMAGE_NAME2 = "image_name2"
+    YEAR = "year"
 
-    FILE_NAME = "arcthegod.png"
+    FILE_NAME = "arcthegod{extension}"
+    IMAGE_MAX_DIMENSION = 400
+    IMAGE_FORMAT = "PNG"
 
-    def __init__(self):
-        self.langs_by_servers = open_json(LANGS_BY_SERVERS_PATH)
+    LANGS_BY_SERVERS = "langs_by_servers"
+    GUILD_ID = "guild_id"
+    LANGS = "langs"
+
+    def __init__(self, persistence: PersistenceService):
+        self._langs_journal = Journal(
+            LANGS_BY_SERVERS_PATH, LANGS_BY_SERVERS_JOURNAL_PATH
+        )
+        self.langs_by_servers: dict[int, list[str]] = self._langs_journal.load(
+            self._apply_langs_record
+        )
+        self._pending_langs_records: list[dict] = []
+        self._persistence = persistence
+        self._persistence.register(
+            self.LANGS_BY_SERVERS,
+            self._snapshot_langs,
+            self._write_langs,
+            self._restore_langs,
+        )
+
+    def _apply_langs_record(self, langs_by_servers: dict, record: dict):
+        langs_by_servers[record[self.GUILD_ID]] = record[self.LANGS]
 
     def get_config(self, config_name: str):
         return self.SAVED_CONFIG[config_name]
@@ -70,6 +105,12 @@ class ConfigurationManager:
         else:
             raise ValueError(f"{mode} isn't a correct value.")
 
+    def get_answer_formatters(self):
+        return {
+            config[self.MODE]: self.get_answer_formatter(config)
+            for config in self.SAVED_CONFIG.values()
+        }
+
     def _strict(self, answer: str):
         return answer
 
@@ -91,11 +132,40 @@ class ConfigurationManager:
 
         return [self.DEFAULT_LANG]
 
+    def get_enabled_langs(self) -> set[str]:
+        enabled_langs = {self.DEFAULT_LANG}
+
+        for langs in self.langs_by_servers.values():
+            enabled_langs.update(langs)
+
+        return enabled_langs
+
     def update_allowed_langs(self, guild_id: int, new_langs: list[str]):
         self.langs_by_servers[guild_id] = new_langs
+        self._pending_langs_records.append(
+            {self.GUILD_ID: guild_id, self.LANGS: new_langs}
+        )
+        self._persistence.mark_dirty(self.LANGS_BY_SERVERS)
+
+    def _snapshot_langs(self):
+        records = self._pending_langs_records
+        self._pending_langs_records = []
+
+        return records, dict(self.langs_by_servers)
+
+    def _restore_langs(self, snapshot: tuple[list[dict], dict]):
+        # Replaying a record twice is harmless, so none of them is skipped.
+        self._pending_langs_records[:0] = snapshot[0]
 
-        with open(LANGS_BY_SERVERS_PATH, "w") as file:
-            file.write(json.dumps(self.langs_by_servers, indent=4))
+    def _write_langs(self, snapshot: tuple[list[dict], dict]):
+        records, langs_by_servers = snapshot
+
+        for record in records:
+            if self._langs_journal.append(record):
+                self._langs_journal.compact(langs_by_servers)
+
+    def close(self):
+        self._langs_journal.close()
 
     def get_descriptions(self):
         return (
@@ -103,6 +173,10 @@ class ConfigurationManager:
             for config_parameters in self.SAVED_CONFIG.values()
         )
 
+    @classmethod
+    def get_file_name(cls, image_path: str) -> str:
+        return cls.FILE_NAME.format(extension=os.path.splitext(image_path)[1])
+
     @classmethod
     def get_lang_emoji(cls, lang: str) -> str:
         return cls.LANGS_DATA[lang][cls.EMOJI]
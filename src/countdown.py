@@ -0,0 +1,140 @@
+import asyncio
+import math
+import traceback
+
+import nextcord
+
+from src.dispatcher import OutboundDispatcher
+
+
+class Countdown:
+    def __init__(
+        self,
+        message: nextcord.Message,
+        embed: nextcord.Embed,
+        duration: int,
+        footer: str,
+        is_running,
+        on_finish,
+        view: nextcord.ui.View = None,
+    ):
+        self.message = message
+        self.embed = embed
+        self.footer = footer
+        self.is_running = is_running
+        self.on_finish = on_finish
+        self.view = view
+        self.end_time = asyncio.get_running_loop().time() + duration
+        self.last_footer: str = None
+        self.dispatcher: OutboundDispatcher = None
+        self.finished = asyncio.get_running_loop().create_future()
+
+    def get_remaining_time(self, current_time: float):
+        return max(0, math.ceil(self.end_time - current_time))
+
+    def render(self, remaining_time: int):
+        plural = "s" * (remaining_time >= 2)
+        return self.footer.format(remaining_time=remaining_time, plural=plural)
+
+    async def edit(self):
+        edit_arguments = {"embed": self.embed}
+
+        if self.view is not None:
+            edit_arguments["view"] = self.view
+
+        if self.dispatcher is None:
+            await self.message.edit(**edit_arguments)
+        else:
+            await self.dispatcher.edit(
+                self.message, OutboundDispatcher.COSMETIC, **edit_arguments
+            )
+
+    async def update(self, footer: str):
+        self.last_footer = footer
+        self.embed.set_footer(text=footer)
+        await self.edit()
+
+    async def finish(self):
+        try:
+            await self.on_finish(self)
+        finally:
+            if not self.finished.done():
+                self.finished.set_result(None)
+
+
+class CountdownTicker:
+    TICK_PERIOD = 1
+    # Maximum number of countdown edits sent on each tick, for all channels.
+    EDIT_BUDGET = 25
+    # When the budget is exceeded, countdowns are only updated on these seconds.
+    COARSE_PERIOD = 5
+    FINAL_SECONDS = 3
+
+    def __init__(self, dispatcher: OutboundDispatcher = None):
+        self.dispatcher = dispatcher
+        self._countdowns: list[Countdown] = []
+        self._task: asyncio.Task = None
+        self._edit_tasks: set[asyncio.Task] = set()
+
+    async def run(self, countdown: Countdown):
+        countdown.dispatcher = self.dispatcher
+        self._countdowns.append(countdown)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        await countdown.finished
+
+    def _is_coarse_tick(self, remaining_time: int):
+        return (
+            remaining_time % self.COARSE_PERIOD == 0
+            or remaining_time <= self.FINAL_SECONDS
+        )
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
+        while self._countdowns:
+            self._tick(loop.time())
+
+            next_tick += self.TICK_PERIOD
+            await asyncio.sleep(max(0, next_tick - loop.time()))
+
+    def _start_edit(self, edit):
+        # Edits may wait for the dispatcher's rate limits, they must not delay the
+        # next tick.
+        task = asyncio.create_task(edit)
+        self._edit_tasks.add(task)
+        task.add_done_callback(self._end_edit)
+
+    def _end_edit(self, task: asyncio.Task):
+        self._edit_tasks.discard(task)
+
+        if not task.cancelled() and (exception := task.exception()) is not None:
+            traceback.print_exception(exception)
+
+    def _tick(self, current_time: float):
+        coarse = len(self._countdowns) > self.EDIT_BUDGET
+        edit_count = 0
+
+        for countdown in self._countdowns.copy():
+            remaining_time = countdown.get_remaining_time(current_time)
+
+            if not remaining_time or not countdown.is_running():
+                self._countdowns.remove(countdown)
+                self._start_edit(countdown.finish())
+                edit_count += 1
+                continue
+
+            if edit_count >= self.EDIT_BUDGET:
+                continue
+
+            if coarse and not self._is_coarse_tick(remaining_time):
+                continue
+
+            footer = countdown.render(remaining_time)
+
+            if footer != countdown.last_footer:
+                self._start_edit(countdown.update(footer))
+                edit_count += 1
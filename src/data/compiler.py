@@ -0,0 +1,209 @@
+import hashlib
+import os
+import pickle
+
+from src.config import ConfigurationManager as cm
+from src.data.question_table import QuestionTable
+from src.data.read_files import GameNames
+from src.paths import (
+    DATA_BUNDLE_PATH,
+    IMAGES_PATH,
+    ITEM_NAMES_PATH,
+    LANGS_DATA_PATH,
+    MOB_NAMES_PATH,
+    NAMES_BUNDLE_PATH,
+    QUESTIONS_PATH,
+)
+
+
+class DataCompiler:
+    VERSION = 4
+    NAMES_SEPARATOR = "\t"
+
+    BUNDLE_VERSION = "version"
+    SOURCES_HASH = "sources_hash"
+    QUESTIONS = "questions"
+    NAMES = "names"
+
+    def __init__(
+        self,
+        langs_data: dict[str, dict],
+        bundle_path=DATA_BUNDLE_PATH,
+        names_bundle_path=NAMES_BUNDLE_PATH,
+    ):
+        self.langs_data = langs_data
+        self.bundle_path = bundle_path
+        self.names_bundle_path = names_bundle_path
+        self._sources_hash = None
+
+    def _get_source_paths(self):
+        source_paths = [QUESTIONS_PATH, LANGS_DATA_PATH]
+
+        for lang in self.langs_data:
+            source_paths.append(MOB_NAMES_PATH.format(lang=lang))
+            source_paths.append(ITEM_NAMES_PATH.format(lang=lang))
+
+        return source_paths
+
+    def get_sources_hash(self):
+        if self._sources_hash is None:
+            self._sources_hash = self._compute_sources_hash()
+
+        return self._sources_hash
+
+    def _compute_sources_hash(self):
+        sources_hash = hashlib.sha256()
+
+        for source_path in self._get_source_paths():
+            sources_hash.update(source_path.encode())
+
+            with open(source_path, "rb") as file:
+                sources_hash.update(hashlib.sha256(file.read()).digest())
+
+        # The image check only depends on which files exist.
+        for image_name in sorted(os.listdir(IMAGES_PATH)):
+            sources_hash.update(image_name.encode())
+
+        return sources_hash.hexdigest()
+
+    @classmethod
+    def get_bundle_id(cls, bundle: dict) -> int:
+        return int(bundle[cls.SOURCES_HASH][:16], 16)
+
+    # pandas is only needed to compile the bundle, not to run the bot.
+    def _read_names_file(self, path: str, lang: str) -> dict[int, str]:
+        import pandas as pd
+
+        names = pd.read_csv(
+            filepath_or_buffer=path.format(lang=lang),
+            index_col=0,
+            usecols=[0, 1],
+            names=[cm.VNUM, lang],
+            encoding=self.langs_data[lang]["encoding"],
+            sep=self.NAMES_SEPARATOR,
+            skiprows=1,
+        )
+
+        return names[lang].dropna().to_dict()
+
+    def read_names(self, lang: str) -> dict[int, dict[int, str]]:
+        return GameNames.create_lang_names(
+            item_names=self._read_names_file(ITEM_NAMES_PATH, lang),
+            mob_names=self._read_names_file(MOB_NAMES_PATH, lang),
+        )
+
+    def _get_questions(self):
+        import pandas as pd
+
+        return pd.read_csv(QUESTIONS_PATH, sep=",", index_col=[cm.VNUM])
+
+    def _check_questions(self, questions, game_names: GameNames):
+        import pandas as pd
+
+        item_vnums = list(game_names.get_vnums(GameNames.ITEM))
+        mob_vnums = list(game_names.get_vnums(GameNames.MONSTER))
+
+        item_questions = questions[
+            (questions[cm.IS_MONSTER] == 0) & (questions.index.isin(item_vnums))
+        ]
+        monster_questions = questions[
+            (questions[cm.IS_MONSTER] == 1) & (questions.index.isin(mob_vnums))
+        ]
+
+        return pd.concat([item_questions, monster_questions])
+
+    def _check_images(self, questions):
+        image_names = set(os.listdir(IMAGES_PATH))
+        questions = questions[questions[cm.IMAGE_NAME1].isin(image_names)].copy()
+        missing_image2 = ~questions[cm.IMAGE_NAME2].isin(image_names)
+        questions.loc[missing_image2, cm.IMAGE_NAME2] = None
+
+        return questions
+
+    def _create_question_table(self, questions):
+        image_names2 = questions[cm.IMAGE_NAME2]
+
+        return QuestionTable(
+            vnums=[int(vnum) for vnum in questions.index],
+            is_monster=[int(value) for value in questions[cm.IS_MONSTER]],
+            image_names1=questions[cm.IMAGE_NAME1].tolist(),
+            image_names2=image_names2.where(image_names2.notna(), None).tolist(),
+            years=[int(year) for year in questions[cm.YEAR]],
+        )
+
+    def compile(self):
+        game_names = GameNames(load_names=self.read_names)
+        game_names.load_langs(list(self.langs_data))
+        questions = self._check_questions(self._get_questions(), game_names)
+        questions = self._check_images(questions)
+        questions = questions.sort_values(cm.YEAR, kind="stable")
+
+        return {
+            self.BUNDLE_VERSION: self.VERSION,
+            self.SOURCES_HASH: self.get_sources_hash(),
+            self.QUESTIONS: self._create_question_table(questions),
+            self.NAMES: {
+                lang: game_names.get_lang_names(lang) for lang in self.langs_data
+            },
+        }
+
+    def _dump(self, bundle: dict, bundle_path: str):
+        os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+        temporary_path = bundle_path + ".tmp"
+
+        with open(temporary_path, "wb") as file:
+            pickle.dump(bundle, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary_path, bundle_path)
+
+    def save(self, bundle: dict):
+        # Names are split by language so that only enabled languages get loaded.
+        for lang, names in bundle[self.NAMES].items():
+            names_bundle = {
+                self.BUNDLE_VERSION: bundle[self.BUNDLE_VERSION],
+                self.SOURCES_HASH: bundle[self.SOURCES_HASH],
+                self.NAMES: names,
+            }
+            self._dump(names_bundle, self.names_bundle_path.format(lang=lang))
+
+        main_bundle = {key: value for key, value in bundle.items() if key != self.NAMES}
+        self._dump(main_bundle, self.bundle_path)
+
+    def _load(self, bundle_path: str) -> dict:
+        if not os.path.exists(bundle_path):
+            return None
+
+        try:
+            with open(bundle_path, "rb") as file:
+                bundle = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+        if (
+            not isinstance(bundle, dict)
+            or bundle.get(self.BUNDLE_VERSION) != self.VERSION
+            or bundle.get(self.SOURCES_HASH) != self.get_sources_hash()
+        ):
+            return None
+
+        return bundle
+
+    def load(self) -> dict:
+        return self._load(self.bundle_path)
+
+    def load_names(self, lang: str) -> dict:
+        names_bundle = self._load(self.names_bundle_path.format(lang=lang))
+
+        if names_bundle is None:
+            return self.read_names(lang)
+
+        return names_bundle[self.NAMES]
+
+    def get_bundle(self):
+        bundle = self.load()
+
+        if bundle is None:
+            bundle = self.compile()
+            self.save(bundle)
+
+        return bundle
@@ -0,0 +1,40 @@
+import random as rd
+
+
+class QuestionTable:
+    def __init__(
+        self,
+        vnums: list[int],
+        is_monster: list[int],
+        image_names1: list[str],
+        image_names2: list[str],
+        years: list[int],
+    ):
+        self.vnums = vnums
+        self.is_monster = is_monster
+        self.image_names1 = image_names1
+        self.image_names2 = image_names2
+        self.years = years
+
+    def __len__(self):
+        return len(self.vnums)
+
+    def get_key(self, index: int) -> tuple[int, int]:
+        return self.vnums[index], self.is_monster[index]
+
+    def get_keys(self) -> list[tuple[int, int]]:
+        return list(zip(self.vnums, self.is_monster))
+
+    def get_image_names(self) -> list[str]:
+        image_names = set(self.image_names1)
+        image_names.update(name for name in self.image_names2 if name is not None)
+
+        return sorted(image_names)
+
+    def choose_image_name(self, index: int, random: rd.Random = rd) -> str:
+        image_name2 = self.image_names2[index]
+
+        if image_name2 is None:
+            return self.image_names1[index]
+
+        return random.choice([self.image_names1[index], image_name2])
@@ -1,37 +1,129 @@
-import os
+import time
 
-import pandas as pd
 
-from src.paths import MOB_NAMES_PATH, ITEM_NAMES_PATH
+class GameNames:
+    UPGRADE_SUFFIX = "+0"
+    NO_BREAK_SPACE = chr(160)
+    ITEM = 0
+    MONSTER = 1
 
+    def __init__(self, load_names):
+        self._load_names = load_names
+        self._names: dict[str, dict[int, dict[int, str]]] = {}
+        self._last_used: dict[str, float] = {}
+        self._formatted_names: dict[tuple[str, str], dict[tuple[int, int], str]] = {}
+        self._precomputed_keys: list[tuple[int, int]] = []
+        self._answer_formatters: dict[str, object] = {}
 
-class GameNames:
-    INDEX_NAME = "vnum"
-    SEPARATOR = "\t"
-
-    def __init__(self, langs_data: dict[str, dict]):
-        self.langs_data = langs_data
-        self.mob_names = self._get_data(MOB_NAMES_PATH)
-        self.item_names = self._get_data(ITEM_NAMES_PATH)
-
-    def _read_csv(self, path: str, lang: str, encoding: str):
-        names = pd.read_csv(
-            filepath_or_buffer=path.format(lang=lang),
-            index_col=0,
-            usecols=[0, 1],
-            names=[self.INDEX_NAME, lang],
-            encoding=encoding,
-            sep=self.SEPARATOR,
-            skiprows=1,
-        )
-
-        return names[lang]
-
-    def _get_data(self, path: str):
-        return pd.concat(
-            (
-                self._read_csv(path, lang, data["encoding"])
-                for lang, data in self.langs_data.items()
-            ),
-            axis=1,
-        )
+    @classmethod
+    def _clean_name(cls, name: str):
+        if name.endswith(cls.UPGRADE_SUFFIX):
+            name = name[: -len(cls.UPGRADE_SUFFIX)]
+
+        return name.replace(cls.NO_BREAK_SPACE, " ").strip()
+
+    @classmethod
+    def create_lang_names(
+        cls, item_names: dict[int, str], mob_names: dict[int, str]
+    ) -> dict[int, dict[int, str]]:
+        return {
+            is_monster: {
+                int(vnum): cls._clean_name(name)
+                for vnum, name in names.items()
+                if isinstance(name, str)
+            }
+            for is_monster, names in ((cls.ITEM, item_names), (cls.MONSTER, mob_names))
+        }
+
+    @property
+    def loaded_langs(self):
+        return set(self._names)
+
+    def get_lang_names(self, lang: str) -> dict[int, dict[int, str]]:
+        self.load_langs([lang])
+
+        return self._names[lang]
+
+    def get_vnums(self, is_monster: int) -> set[int]:
+        return {
+            vnum
+            for lang_names in self._names.values()
+            for vnum in lang_names[is_monster]
+        }
+
+    def load_langs(self, langs: list[str]):
+        current_time = time.monotonic()
+
+        for lang in langs:
+            self._last_used[lang] = current_time
+
+            if lang in self._names:
+                continue
+
+            self._names[lang] = self._load_names(lang)
+            self._precompute_lang(lang)
+
+    def unload_unused_langs(self, resident_langs: set[str], max_idle_time: float):
+        current_time = time.monotonic()
+
+        for lang in self.loaded_langs - resident_langs:
+            if current_time - self._last_used[lang] < max_idle_time:
+                continue
+
+            del self._names[lang]
+
+            for mode in self._answer_formatters:
+                self._formatted_names.pop((mode, lang), None)
+
+    def _get_display_name(self, lang: str, key: tuple[int, int]) -> str:
+        vnum, is_monster = key
+
+        return self._names[lang][is_monster].get(vnum)
+
+    def _get_formatted_name(
+        self, lang: str, key: tuple[int, int], mode: str, answer_formatter
+    ) -> str:
+        formatted_names = self._formatted_names.setdefault((mode, lang), {})
+
+        if key not in formatted_names:
+            name = self._get_display_name(lang, key)
+            formatted_names[key] = None if name is None else answer_formatter(name)
+
+        return formatted_names[key]
+
+    def get_display_names(
+        self, vnum: int, is_monster: int, langs: list[str]
+    ) -> dict[str, str]:
+        key = (vnum, is_monster)
+        self.load_langs(langs)
+        display_names = {lang: self._get_display_name(lang, key) for lang in langs}
+
+        return {lang: name for lang, name in display_names.items() if name is not None}
+
+    def get_formatted_names(
+        self, vnum: int, is_monster: int, langs: list[str], mode: str, answer_formatter
+    ) -> dict[str, str]:
+        key = (vnum, is_monster)
+        self.load_langs(langs)
+        formatted_names = {
+            lang: self._get_formatted_name(lang, key, mode, answer_formatter)
+            for lang in langs
+        }
+
+        return {
+            lang: name for lang, name in formatted_names.items() if name is not None
+        }
+
+    def _precompute_lang(self, lang: str):
+        for mode, answer_formatter in self._answer_formatters.items():
+            for key in self._precomputed_keys:
+                self._get_formatted_name(lang, key, mode, answer_formatter)
+
+    def precompute_names(
+        self, keys: list[tuple[int, int]], answer_formatters: dict[str, object]
+    ):
+        self._precomputed_keys = keys
+        self._answer_formatters = answer_formatters
+
+        for lang in self._names:
+            self._precompute_lang(lang)
@@ -0,0 +1,257 @@
+import asyncio
+from collections import deque
+
+import nextcord
+
+
+class RateBudget:
+    def __init__(self, limit: int, period: float):
+        self.limit = limit
+        self.period = period
+        self._calls: deque[float] = deque()
+        self._blocked_until = 0
+
+    def _clean(self, current_time: float):
+        while self._calls and self._calls[0] + self.period <= current_time:
+            self._calls.popleft()
+
+    def get_delay(self, current_time: float, reserved: int = 0):
+        if current_time < self._blocked_until:
+            return self._blocked_until - current_time
+
+        self._clean(current_time)
+        allowed_calls = self.limit - reserved
+
+        if len(self._calls) < allowed_calls:
+            return 0
+
+        return (
+            self._calls[len(self._calls) - allowed_calls] + self.period - current_time
+        )
+
+    def consume(self, current_time: float):
+        self._calls.append(current_time)
+
+    def block(self, until: float):
+        self._blocked_until = max(self._blocked_until, until)
+
+
+class OutboundRequest:
+    def __init__(
+        self,
+        priority: int,
+        sequence: int,
+        channel_id: int,
+        route: str,
+        call,
+        merge_key: tuple = None,
+    ):
+        self.priority = priority
+        self.sequence = sequence
+        self.channel_id = channel_id
+        self.route = route
+        self.call = call
+        self.merge_key = merge_key
+        self.retries = 0
+        self.future = asyncio.get_running_loop().create_future()
+
+    def __lt__(self, other: "OutboundRequest"):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class OutboundDispatcher:
+    QUESTION = 0
+    HINT = 1
+    COSMETIC = 2
+
+    SEND = "send"
+    EDIT = "edit"
+    DELETE = "delete"
+
+    # Discord allows 50 requests per second for the whole bot and about 5
+    # requests per 5 seconds for each route of a channel.
+    GLOBAL_LIMIT = 40
+    GLOBAL_PERIOD = 1
+    CHANNEL_LIMIT = 5
+    CHANNEL_PERIOD = 5
+    # Number of requests of each channel budget kept for questions and answers.
+    RESERVED_FOR_QUESTIONS = 1
+
+    TOO_MANY_REQUESTS = 429
+    DEFAULT_RETRY_AFTER = 1
+    MAX_RETRIES = 3
+
+    def __init__(self):
+        self._pending: list[OutboundRequest] = []
+        self._merge_keys: dict[tuple, OutboundRequest] = {}
+        # Shared by every request, whatever its route or channel.
+        self._global_budget = RateBudget(self.GLOBAL_LIMIT, self.GLOBAL_PERIOD)
+        self._budgets: dict[tuple, RateBudget] = {}
+        self._sequence = 0
+        self._wake_up = asyncio.Event()
+        self._task: asyncio.Task = None
+        self._running_tasks: set[asyncio.Task] = set()
+
+    def _get_budgets(self, request: OutboundRequest):
+        channel_key = (request.route, request.channel_id)
+
+        if channel_key not in self._budgets:
+            self._budgets[channel_key] = RateBudget(
+                self.CHANNEL_LIMIT, self.CHANNEL_PERIOD
+            )
+
+        return self._global_budget, self._budgets[channel_key]
+
+    def _get_delay(self, request: OutboundRequest, current_time: float):
+        global_budget, channel_budget = self._get_budgets(request)
+        reserved = (
+            0 if request.priority == self.QUESTION else self.RESERVED_FOR_QUESTIONS
+        )
+
+        return max(
+            global_budget.get_delay(current_time),
+            channel_budget.get_delay(current_time, reserved),
+        )
+
+    def submit(
+        self,
+        priority: int,
+        channel_id: int,
+        route: str,
+        call,
+        merge_key: tuple = None,
+    ) -> asyncio.Future:
+        self._sequence += 1
+        request = OutboundRequest(
+            priority, self._sequence, channel_id, route, call, merge_key
+        )
+
+        if merge_key is not None and merge_key in self._merge_keys:
+            superseded_request = self._merge_keys.pop(merge_key)
+            self._pending.remove(superseded_request)
+            self._resolve(superseded_request, None)
+
+        self._enqueue(request)
+
+        return request.future
+
+    def _enqueue(self, request: OutboundRequest):
+        if request.merge_key is not None:
+            self._merge_keys[request.merge_key] = request
+
+        self._pending.append(request)
+        self._wake_up.set()
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _resolve(self, request: OutboundRequest, result):
+        if not request.future.done():
+            request.future.set_result(result)
+
+    def send(self, channel: nextcord.abc.Messageable, priority: int, **kwargs):
+        return self.submit(
+            priority, channel.id, self.SEND, lambda: channel.send(**kwargs)
+        )
+
+    def followup(self, interaction: nextcord.Interaction, priority: int, **kwargs):
+        return self.submit(
+            priority,
+            interaction.channel_id,
+            self.SEND,
+            lambda: interaction.send(**kwargs),
+        )
+
+    def reply(self, message: nextcord.Message, priority: int, content: str):
+        return self.submit(
+            priority, message.channel.id, self.SEND, lambda: message.reply(content)
+        )
+
+    def edit(self, message: nextcord.Message, priority: int, **kwargs):
+        # Only the last edit of a message matters, older pending ones are dropped.
+        return self.submit(
+            priority,
+            message.channel.id,
+            self.EDIT,
+            lambda: message.edit(**kwargs),
+            merge_key=(self.EDIT, message.id),
+        )
+
+    def delete(self, message: nextcord.Message, priority: int):
+        return self.submit(priority, message.channel.id, self.DELETE, message.delete)
+
+    def _pop_next_request(self, current_time: float):
+        min_delay = None
+
+        for request in sorted(self._pending):
+            delay = self._get_delay(request, current_time)
+
+            if not delay:
+                self._pending.remove(request)
+
+                if request.merge_key is not None:
+                    del self._merge_keys[request.merge_key]
+
+                return request, 0
+
+            if min_delay is None or delay < min_delay:
+                min_delay = delay
+
+        return None, min_delay
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while self._pending:
+            self._wake_up.clear()
+            current_time = loop.time()
+            request, delay = self._pop_next_request(current_time)
+
+            if request is not None:
+                for budget in self._get_budgets(request):
+                    budget.consume(current_time)
+
+                task = asyncio.create_task(self._execute(request))
+                self._running_tasks.add(task)
+                task.add_done_callback(self._running_tasks.discard)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake_up.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _is_rate_limited(self, error: Exception):
+        return getattr(error, "status", None) == self.TOO_MANY_REQUESTS
+
+    async def _execute(self, request: OutboundRequest):
+        try:
+            result = await request.call()
+
+        except Exception as error:
+            if not self._is_rate_limited(error) or request.retries >= self.MAX_RETRIES:
+                if not request.future.done():
+                    request.future.set_exception(error)
+                return
+
+            retry_after = getattr(error, "retry_after", self.DEFAULT_RETRY_AFTER)
+            blocked_until = asyncio.get_running_loop().time() + retry_after
+            global_budget, channel_budget = self._get_budgets(request)
+            channel_budget.block(blocked_until)
+
+            if getattr(error, "is_global", False):
+                global_budget.block(blocked_until)
+
+            request.retries += 1
+            self._requeue(request)
+
+        else:
+            self._resolve(request, result)
+
+    def _requeue(self, request: OutboundRequest):
+        if request.merge_key in self._merge_keys:
+            # A newer edit of the same message is already waiting.
+            self._resolve(request, None)
+            return
+
+        self._enqueue(request)
@@ -0,0 +1,83 @@
+import os
+import sqlite3
+
+from src.paths import ELO_DATABASE_PATH, LEADERBOARD_PATH
+from src.utils.utils import open_json
+
+
+class EloStore:
+    ELO = "elo"
+    NAME = "name"
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS ratings (
+            guild_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            name TEXT,
+            elo INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, player_id)
+        );
+        CREATE INDEX IF NOT EXISTS ratings_by_elo ON ratings (guild_id, elo DESC);
+    """
+    UPSERT = """
+        INSERT INTO ratings (guild_id, player_id, name, elo) VALUES (?, ?, ?, ?)
+        ON CONFLICT (guild_id, player_id)
+        DO UPDATE SET name = excluded.name, elo = excluded.elo
+    """
+
+    def __init__(
+        self,
+        database_path: str = ELO_DATABASE_PATH,
+        leaderboard_path: str = LEADERBOARD_PATH,
+    ):
+        # Only used by one thread at a time: at startup, then by the persistence worker.
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(self.SCHEMA)
+
+        if self.is_empty():
+            self.import_leaderboard_file(leaderboard_path)
+
+    def close(self):
+        self._connection.close()
+
+    def is_empty(self) -> bool:
+        return (
+            self._connection.execute("SELECT 1 FROM ratings LIMIT 1").fetchone() is None
+        )
+
+    def get_all_ratings(self) -> list[tuple[int, int, str, int]]:
+        return self._connection.execute(
+            "SELECT guild_id, player_id, name, elo FROM ratings ORDER BY rowid"
+        ).fetchall()
+
+    def update_ratings(self, ratings: list[tuple[int, int, str, int]]):
+        with self._connection:
+            self._connection.executemany(self.UPSERT, ratings)
+
+    def import_leaderboard(self, leaderboard: dict[int, dict[int, dict]]) -> int:
+        # Registered players who never finished a ranked quiz have no elo.
+        rows = [
+            (guild_id, player_id, player_info.get(self.NAME), player_info[self.ELO])
+            for guild_id, players in leaderboard.items()
+            for player_id, player_info in players.items()
+            if self.ELO in player_info
+        ]
+
+        with self._connection:
+            self._connection.executemany(self.UPSERT, rows)
+
+        return len(rows)
+
+    def import_leaderboard_file(self, leaderboard_path: str) -> int:
+        if not os.path.exists(leaderboard_path):
+            return 0
+
+        return self.import_leaderboard(open_json(leaderboard_path))
+
+
+if __name__ == "__main__":
+    elo_store = EloStore()
+    imported = elo_store.import_leaderboard_file(LEADERBOARD_PATH)
+    elo_store.close()
+    print(f"{imported} ratings imported from {LEADERBOARD_PATH}.")
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+
+def create_variant(
+    source_path: str, cache_path: str, max_dimension: int, image_format: str
+):
+    try:
+        with open(source_path, "rb") as file:
+            source = file.read()
+    except OSError:
+        return None
+
+    settings = f"{max_dimension}:{image_format}".encode()
+    digest = hashlib.sha256(source + settings).hexdigest()
+    variant_name = f"{digest}.{image_format.lower()}"
+    variant_path = os.path.join(cache_path, variant_name)
+
+    if os.path.exists(variant_path):
+        return variant_name
+
+    try:
+        with Image.open(BytesIO(source)) as image:
+            image.thumbnail((max_dimension, max_dimension))
+            buffer = BytesIO()
+            image.save(buffer, format=image_format, optimize=True)
+    except OSError:
+        return None
+
+    variant = buffer.getvalue()
+
+    if len(variant) >= len(source) and image_format.lower() == "png":
+        variant = source
+
+    temporary_path = variant_path + ".tmp"
+
+    with open(temporary_path, "wb") as file:
+        file.write(variant)
+
+    os.replace(temporary_path, variant_path)
+
+    return variant_name
+
+
+class ImageCache:
+    INDEX_NAME = "index.json"
+    MTIME = "mtime"
+    SIZE = "size"
+    VARIANT = "variant"
+
+    def __init__(
+        self, images_path: str, cache_path: str, max_dimension: int, image_format: str
+    ):
+        self.images_path = images_path
+        self.cache_path = cache_path
+        self.max_dimension = max_dimension
+        self.image_format = image_format
+        self.index_path = os.path.join(cache_path, self.INDEX_NAME)
+        self._index: dict[str, dict] = self._get_index()
+
+    def _get_index(self) -> dict:
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+
+        return {}
+
+    def _save_index(self):
+        temporary_path = self.index_path + ".tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(json.dumps(self._index, indent=4))
+
+        os.replace(temporary_path, self.index_path)
+
+    def _get_source_path(self, image_name: str):
+        return os.path.join(self.images_path, image_name)
+
+    def _get_source_info(self, image_name: str):
+        try:
+            stat = os.stat(self._get_source_path(image_name))
+        except OSError:
+            return None
+
+        return {self.MTIME: stat.st_mtime_ns, self.SIZE: stat.st_size}
+
+    def _is_stale(self, image_name: str):
+        entry = self._index.get(image_name)
+        source_info = self._get_source_info(image_name)
+
+        if entry is None or source_info is None:
+            return True
+
+        return (
+            entry[self.MTIME] != source_info[self.MTIME]
+            or entry[self.SIZE] != source_info[self.SIZE]
+            or not os.path.exists(os.path.join(self.cache_path, entry[self.VARIANT]))
+        )
+
+    def build(self, image_names: list[str]):
+        os.makedirs(self.cache_path, exist_ok=True)
+        stale_names = [name for name in set(image_names) if self._is_stale(name)]
+
+        if not stale_names:
+            return
+
+        with ProcessPoolExecutor() as executor:
+            variant_names = executor.map(
+                create_variant,
+                [self._get_source_path(name) for name in stale_names],
+                [self.cache_path] * len(stale_names),
+                [self.max_dimension] * len(stale_names),
+                [self.image_format] * len(stale_names),
+                chunksize=32,
+            )
+
+            for image_name, variant_name in zip(stale_names, variant_names):
+                source_info = self._get_source_info(image_name)
+
+                if variant_name is None or source_info is None:
+                    self._index.pop(image_name, None)
+                    continue
+
+                self._index[image_name] = {**source_info, self.VARIANT: variant_name}
+
+        self._save_index()
+
+    def get_path(self, image_name: str):
+        entry = self._index.get(image_name)
+
+        if entry is None:
+            return self._get_source_path(image_name)
+
+        return os.path.join(self.cache_path, entry[self.VARIANT])
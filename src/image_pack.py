@@ -0,0 +1,84 @@
+import json
+import mmap
+import os
+import struct
+
+from src.paths import IMAGES_PACK_PATH
+
+
+class ImagePack:
+    MAGIC = b"QZIP"
+    VERSION = 1
+    HEADER = struct.Struct("<4sII")
+
+    def __init__(self, pack_path: str):
+        self.pack_path = pack_path
+        self._file = open(pack_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._index, self._data_offset = self._read_index()
+
+    def _read_index(self) -> tuple[dict[str, list[int]], int]:
+        magic, version, index_size = self.HEADER.unpack_from(self._mmap, 0)
+
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{self.pack_path} isn't a valid image pack.")
+
+        index_start = self.HEADER.size
+        index = json.loads(bytes(self._view[index_start : index_start + index_size]))
+
+        return index, index_start + index_size
+
+    @classmethod
+    def open(cls, pack_path: str):
+        if not os.path.exists(pack_path):
+            return None
+
+        try:
+            return cls(pack_path)
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def write(cls, pack_path: str, image_paths: list[str]):
+        index = {}
+        offset = 0
+
+        for image_path in image_paths:
+            length = os.path.getsize(image_path)
+            index[os.path.basename(image_path)] = [offset, length]
+            offset += length
+
+        encoded_index = json.dumps(index, separators=(",", ":")).encode()
+        temporary_path = pack_path + ".tmp"
+
+        with open(temporary_path, "wb") as pack:
+            pack.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(encoded_index)))
+            pack.write(encoded_index)
+
+            for image_path in image_paths:
+                with open(image_path, "rb") as image:
+                    pack.write(image.read())
+
+        os.replace(temporary_path, pack_path)
+
+    def __contains__(self, image_name: str):
+        return image_name in self._index
+
+    def get(self, image_name: str) -> memoryview:
+        offset, length = self._index[image_name]
+        start = self._data_offset + offset
+
+        return self._view[start : start + length]
+
+
+if __name__ == "__main__":
+    from src.config import ConfigurationManager as cm
+    from src.persistence import PersistenceService
+    from src.quiz_manager import QuizManager
+
+    image_paths = QuizManager(
+        PersistenceService(cm.PERSISTENCE_DELAY)
+    ).get_image_paths()
+    ImagePack.write(IMAGES_PACK_PATH, image_paths)
+    print(f"{len(image_paths)} images written to {IMAGES_PACK_PATH}.")
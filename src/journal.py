@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+
+from src.utils.utils import json_converter, open_json, read_bytes
+
+
+class Journal:
+    FSYNC_BATCH = 16
+    COMPACT_RECORDS = 500
+    COMPACTING_SUFFIX = ".compacting"
+
+    def __init__(self, snapshot_path: str, journal_path: str):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compacting_path = journal_path + self.COMPACTING_SUFFIX
+        self._lock = threading.Lock()
+        self._file = None
+        self._records = 0
+        self._unsynced = 0
+        self._is_compacting = False
+
+    def _replay(self, path: str, state: dict, apply) -> int:
+        valid_size = 0
+
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                # A crash can leave a partially written last record.
+                if not line.endswith("\n"):
+                    break
+
+                try:
+                    record = json.loads(line, object_hook=json_converter)
+                except json.JSONDecodeError:
+                    break
+
+                apply(state, record)
+                valid_size += len(line.encode("utf-8"))
+                self._records += 1
+
+        return valid_size
+
+    def load(self, apply) -> dict:
+        state = (
+            open_json(self.snapshot_path) if os.path.exists(self.snapshot_path) else {}
+        )
+
+        # Records are idempotent, replaying some already in the snapshot is fine.
+        if os.path.exists(self.compacting_path):
+            self._replay(self.compacting_path, state, apply)
+
+        if os.path.exists(self.journal_path):
+            valid_size = self._replay(self.journal_path, state, apply)
+            os.truncate(self.journal_path, valid_size)
+
+        return state
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def append(self, record: dict) -> bool:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, "a", encoding="utf-8")
+
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            self._records += 1
+            self._unsynced += 1
+
+            if self._unsynced >= self.FSYNC_BATCH:
+                self._sync()
+
+            return self._records >= self.COMPACT_RECORDS and not self._is_compacting
+
+    def _close(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def compact(self, state: dict):
+        with self._lock:
+            if self._is_compacting:
+                return
+
+            self._is_compacting = True
+            self._close()
+
+            if os.path.exists(self.compacting_path) and os.path.exists(
+                self.journal_path
+            ):
+                # A previous snapshot failed, keep its records until one succeeds.
+                with open(self.compacting_path, "ab") as compacting_file:
+                    compacting_file.write(read_bytes(self.journal_path))
+
+                os.remove(self.journal_path)
+            elif os.path.exists(self.journal_path):
+                os.replace(self.journal_path, self.compacting_path)
+
+            self._records = 0
+
+        threading.Thread(
+            target=self._write_snapshot, args=(state,), daemon=True
+        ).start()
+
+    def _write_snapshot(self, state: dict):
+        temporary_path = self.snapshot_path + ".tmp"
+
+        try:
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                file.write(json.dumps(state, indent=4))
+                file.flush()
+                os.fsync(file.fileno())
+
+            os.replace(temporary_path, self.snapshot_path)
+
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+        finally:
+            with self._lock:
+                self._is_compacting = False
@@ -0,0 +1,24 @@
+from collections import OrderedDict
+
+
+class LeaderboardCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[int, tuple[int, list[tuple]]] = OrderedDict()
+
+    def get(self, guild_id: int, version: int):
+        entry = self._entries.get(guild_id)
+
+        if entry is None or entry[0] != version:
+            return None
+
+        self._entries.move_to_end(guild_id)
+
+        return entry[1]
+
+    def put(self, guild_id: int, version: int, leaderboard: list[tuple]):
+        self._entries[guild_id] = (version, leaderboard)
+        self._entries.move_to_end(guild_id)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -5,12 +5,20 @@ CONSOLE_PATH = "output-1187021385093107765.log"
 
 CONFIG_PATH = os.path.join("src", "config.json")
 LANGS_BY_SERVERS_PATH = os.path.join("src", "data", "langs_by_servers.json")
+LANGS_BY_SERVERS_JOURNAL_PATH = os.path.join("src", "data", "langs_by_servers.journal")
 LANGS_DATA_PATH = os.path.join("src", "data", "langs_data.json")
 
 QUESTIONS_PATH = os.path.join("src", "data", "questions.csv")
 IMAGES_PATH = os.path.join("src", "data", "0_images")
+IMAGES_CACHE_PATH = os.path.join("src", "data", "images_cache")
+IMAGES_PACK_PATH = os.path.join("src", "data", "images.pack")
+
+DATA_BUNDLE_PATH = os.path.join("src", "data", "bundle", "data.bundle")
+NAMES_BUNDLE_PATH = os.path.join("src", "data", "bundle", "{lang}_names.bundle")
 
 LEADERBOARD_PATH = os.path.join("src", "data", "leaderboard.json")
+ELO_DATABASE_PATH = os.path.join("src", "data", "elo.sqlite3")
+QUESTION_DECKS_PATH = os.path.join("src", "data", "question_decks.bin")
 
 MOB_NAMES_PATH = os.path.join("src", "data", "{lang}", "mob_names.txt")
 ITEM_NAMES_PATH = os.path.join("src", "data", "{lang}", "item_names.txt")
\ No newline at end of file
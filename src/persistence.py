@@ -0,0 +1,73 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import traceback
+
+
+class PersistenceService:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._writers: dict[str, tuple] = {}
+        self._dirty: set[str] = set()
+        self._failed: deque[tuple] = deque()
+        self._flush_handle: asyncio.TimerHandle = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def register(self, name: str, snapshot, write, restore=None):
+        # snapshot and restore run on the event loop, write runs in the worker thread.
+        # Without restore, the next snapshot must cover the data of a failed write.
+        self._writers[name] = (snapshot, write, restore)
+
+    def mark_dirty(self, name: str):
+        self._dirty.add(name)
+
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.delay, self._flush
+            )
+
+    def _take_snapshots(self):
+        snapshots = [(name, self._writers[name][0]()) for name in self._dirty]
+        self._dirty.clear()
+
+        return snapshots
+
+    def _write(self, snapshots: list[tuple]):
+        for name, data in snapshots:
+            try:
+                self._writers[name][1](data)
+            except Exception:
+                traceback.print_exc()
+                self._failed.append((name, data))
+
+    def _restore_failed(self) -> set[str]:
+        names = set()
+
+        while self._failed:
+            name, data = self._failed.popleft()
+            restore = self._writers[name][2]
+
+            if restore is not None:
+                restore(data)
+
+            names.add(name)
+
+        return names
+
+    def _on_written(self, _):
+        for name in self._restore_failed():
+            self.mark_dirty(name)
+
+    def _flush(self):
+        self._flush_handle = None
+        future = self._executor.submit(self._write, self._take_snapshots())
+        asyncio.wrap_future(future).add_done_callback(self._on_written)
+
+    def close(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._executor.shutdown(wait=True)
+        self._dirty.update(self._restore_failed())
+        self._write(self._take_snapshots())
@@ -0,0 +1,138 @@
+from bisect import bisect_right
+import random as rd
+import struct
+
+
+class QuestionDeck:
+    MAGIC = b"QDCK"
+    FORMAT_VERSION = 1
+    FILE_HEADER = struct.Struct("<4sI")
+    HEADER = struct.Struct("<qQiII")
+
+    def __init__(
+        self,
+        bundle_id: int,
+        year: int,
+        pool_size: int,
+        used: int = 0,
+        history: bytearray = None,
+    ):
+        self.bundle_id = bundle_id
+        self.year = year
+        self.pool_size = pool_size
+        self.used = used
+        self.history = (
+            history if history is not None else bytearray((pool_size + 7) // 8)
+        )
+
+    def reset(self, bundle_id: int, year: int, pool_size: int):
+        self.bundle_id = bundle_id
+        self.year = year
+        self.pool_size = pool_size
+        self.used = 0
+        self.history = bytearray((pool_size + 7) // 8)
+
+    def is_used(self, index: int):
+        return self.history[index >> 3] >> (index & 7) & 1
+
+    def mark_used(self, index: int):
+        self.history[index >> 3] |= 1 << (index & 7)
+        self.used += 1
+
+    def dump(self, guild_id: int) -> bytes:
+        header = self.HEADER.pack(
+            guild_id, self.bundle_id, self.year, self.pool_size, self.used
+        )
+
+        return header + self.history
+
+    @classmethod
+    def dump_all(cls, decks: dict[int, "QuestionDeck"]) -> bytes:
+        file_header = cls.FILE_HEADER.pack(cls.MAGIC, cls.FORMAT_VERSION)
+
+        return file_header + b"".join(
+            deck.dump(guild_id) for guild_id, deck in decks.items()
+        )
+
+    @classmethod
+    def load_all(cls, data: bytes) -> dict[int, "QuestionDeck"]:
+        # Decks that can't be read are all dropped, they only avoid repetitions.
+        file_header = cls.FILE_HEADER.pack(cls.MAGIC, cls.FORMAT_VERSION)
+
+        if data[: cls.FILE_HEADER.size] != file_header:
+            return {}
+
+        decks = {}
+        offset = cls.FILE_HEADER.size
+
+        while offset < len(data):
+            if offset + cls.HEADER.size > len(data):
+                return {}
+
+            guild_id, bundle_id, year, pool_size, used = cls.HEADER.unpack_from(
+                data, offset
+            )
+            offset += cls.HEADER.size
+            history_size = (pool_size + 7) // 8
+
+            if used > pool_size or offset + history_size > len(data):
+                return {}
+
+            history = bytearray(data[offset : offset + history_size])
+            offset += history_size
+            decks[guild_id] = cls(bundle_id, year, pool_size, used, history)
+
+        return decks
+
+
+class QuestionSampler:
+    ALL_YEARS = -1
+
+    def __init__(self, years: list[int], bundle_id: int, seed: int = None):
+        if any(previous > year for previous, year in zip(years, years[1:])):
+            raise ValueError("Questions must be sorted by year.")
+
+        self.bundle_id = bundle_id
+        self.random = rd.Random(seed)
+        self._total = len(years)
+        self._years = sorted(set(years))
+        self._offsets = [bisect_right(years, year) for year in self._years]
+
+    def get_pool_size(self, year: int) -> int:
+        if year == self.ALL_YEARS:
+            return self._total
+
+        position = bisect_right(self._years, year)
+
+        return self._offsets[position - 1] if position else 0
+
+    def _check_sample_size(self, pool_size: int, k: int):
+        if not 0 <= k <= pool_size:
+            raise ValueError("Sample larger than population or is negative")
+
+    def draw(
+        self, year: int, k: int, deck: QuestionDeck, reset_fraction: float
+    ) -> list[int]:
+        pool_size = self.get_pool_size(year)
+        self._check_sample_size(pool_size, k)
+
+        # A recompiled bundle can reorder questions even if the pool size is kept.
+        if (
+            deck.bundle_id != self.bundle_id
+            or deck.year != year
+            or deck.pool_size != pool_size
+            or deck.used + k > reset_fraction * pool_size
+        ):
+            deck.reset(self.bundle_id, year, pool_size)
+
+        # At most reset_fraction of the pool is used, so rejections stay rare.
+        indices = []
+
+        while len(indices) < k:
+            index = self.random.randrange(pool_size)
+
+            if not deck.is_used(index):
+                deck.mark_used(index)
+                indices.append(index)
+
+        return indices
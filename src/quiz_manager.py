@@ -1,28 +1,41 @@
+import asyncio
+from collections import deque
+from datetime import datetime
 import random as rd
-import json
 import os
 
-from fuzzywuzzy import fuzz
-import pandas as pd
 import nextcord
-from nextcord.ext import tasks
 
+from src.answer_matcher import AnswerMatcher, MatcherStats
+from src.data.compiler import DataCompiler
+from src.data.question_table import QuestionTable
 from src.data.read_files import GameNames
+from src.elo_store import EloStore
+from src.image_cache import ImageCache
+from src.image_pack import ImagePack
+from src.persistence import PersistenceService
 from src.utils.utils import (
     format_number_with_sign,
-    elo_formula,
+    elo_augmentations,
     convert_rank,
-    open_json,
     convert_rank,
-    get_current_time,
+    read_bytes,
 )
 from src.config import ConfigurationManager as cm
-from src.paths import IMAGES_PATH, QUESTIONS_PATH, LEADERBOARD_PATH
+from src.question_sampler import QuestionDeck, QuestionSampler
+from src.rating_index import RatingIndex
+from src.paths import (
+    IMAGES_PATH,
+    IMAGES_CACHE_PATH,
+    IMAGES_PACK_PATH,
+    QUESTION_DECKS_PATH,
+)
 
 
 class Player:
     def __init__(self, player: nextcord.Member, elo: int = None, score: int = 0):
         self.id = player.id
+        self.user_name = player.name
         self.name = player.display_name
         self.avatar = player.display_avatar
         self.elo = elo
@@ -59,6 +72,8 @@ class Question:
         answer_formatter,
         fuzz_threshold: int,
         answers: dict[str, str],
+        formatted_answers: dict[str, str] = None,
+        matcher_stats: MatcherStats = None,
     ):
         self.image_path = image_path
         self.allowed_langs = allowed_langs
@@ -68,9 +83,14 @@ class Question:
         self.answer_formatter = answer_formatter
         self.fuzz_threshold = fuzz_threshold
         self.answers = self._filter_answer(answers)
-        self.formatted_answers = self._get_formatted_answers()
+        self.formatted_answers = self._get_formatted_answers(formatted_answers)
+        self.answer_matcher = AnswerMatcher(
+            self.formatted_answers, answer_formatter, fuzz_threshold, matcher_stats
+        )
         self.hints = self._get_default_hints()
         self.hints_shuffle = self._get_hints_shuffle()
+        self.hint_deadlines = self._get_hint_deadlines()
+        self.start_time: float = None
         self.check_answer_count = 0
         self.hint_shown = 0
         self.first_message: nextcord.Message = None
@@ -88,8 +108,13 @@ class Question:
     def _get_formatted_answer(self, answer: str):
         return self.answer_formatter(answer)
 
-    def _get_formatted_answers(self):
-        return [self._get_formatted_answer(answer) for answer in self.answers.values()]
+    def _get_formatted_answers(self, formatted_answers: dict[str, str]):
+        if formatted_answers is None:
+            return [
+                self._get_formatted_answer(answer) for answer in self.answers.values()
+            ]
+
+        return [formatted_answers[lang] for lang in self.answers]
 
     def _get_default_hint(self, answer: str):
         return [
@@ -115,20 +140,24 @@ class Question:
             for lang, answer in self.answers.items()
         }
 
+    def _get_hint_deadlines(self):
+        # The last deadline is the end of the question.
+        return [
+            (hint_number + 1) * self.time_between_hints
+            for hint_number in range(self.max_hint + 1)
+        ]
+
     def add_first_message(self, message: nextcord.Message):
         self.last_message = message
         self.first_message = message
         self.first_message_timestamp = message.created_at.timestamp()
+        self.start_time = asyncio.get_running_loop().time()
 
-    def show_hint(self):
-        if (
-            get_current_time() - self.first_message.created_at
-        ).total_seconds() + cm.CHECK_ANSWER_PERIOD / 2 >= (
-            self.hint_shown + 1
-        ) * self.time_between_hints:
-            return True
+    def next_hint_deadline(self):
+        return self.start_time + self.hint_deadlines[self.hint_shown]
 
-        return False
+    def show_hint(self):
+        return asyncio.get_running_loop().time() >= self.next_hint_deadline()
 
     def under_hint_limit(self):
         return self.hint_shown < self.max_hint
@@ -156,20 +185,33 @@ class Question:
         self.hint_shown += 1
 
     def is_correct_answer(self, user_answer: str):
-        formatted_user_answer = self.answer_formatter(user_answer)
+        return self.answer_matcher.is_match(user_answer)
 
-        for formatted_answer in self.formatted_answers:
-            if (
-                fuzz.ratio(formatted_user_answer, formatted_answer)
-                >= self.fuzz_threshold
-            ):
-                return True
-        return False
+    def is_allowed_player(self, author_id: int):
+        return not self.allowed_players or author_id in self.allowed_players
 
     def is_winner(self, message_content: str, author_id: int):
-        return (
-            not self.allowed_players or author_id in self.allowed_players
-        ) and self.is_correct_answer(message_content)
+        return self.is_allowed_player(author_id) and self.is_correct_answer(
+            message_content
+        )
+
+    def find_winners(self, messages: list[nextcord.Message]):
+        messages = [
+            message for message in messages if self.is_allowed_player(message.author.id)
+        ]
+        matches = self.answer_matcher.match_many(
+            [self.answer_formatter(message.content) for message in messages]
+        )
+
+        return [message for message, match in zip(messages, matches) if match]
+
+    def find_first_winner(self, messages: list[nextcord.Message]):
+        winners = self.find_winners(messages)
+
+        if not winners:
+            return None, []
+
+        return winners[0], winners[1:]
 
 
 class Quiz:
@@ -177,8 +219,13 @@ class Quiz:
         self,
         config_manager: cm,
         guild_id: int,
-        questions: pd.DataFrame,
+        questions: QuestionTable,
+        question_sampler: QuestionSampler,
+        question_deck: QuestionDeck,
         game_names: GameNames,
+        image_cache: ImageCache,
+        image_pack: ImagePack,
+        matcher_stats: MatcherStats,
         number_of_question: int,
         config_name: str,
         game_category: str,
@@ -186,7 +233,12 @@ class Quiz:
     ):
         self._config_manager = config_manager
         self._questions = questions
+        self._question_sampler = question_sampler
+        self._question_deck = question_deck
         self._game_names = game_names
+        self._image_cache = image_cache
+        self._image_pack = image_pack
+        self._matcher_stats = matcher_stats
         self._config_name = config_name
         self._config = self._get_config()
 
@@ -197,6 +249,7 @@ class Quiz:
         self.allowed_langs = self._get_allowed_langs()
         self.max_hint = self._get_max_hint()
         self.time_between_hints = self._get_time_between_hint()
+        self.mode = self._get_mode()
         self.answer_formatter = self._get_answer_formatter()
         self.fuzz_threshold = self._get_fuzz_threshold()
         self.game_category = game_category
@@ -204,6 +257,16 @@ class Quiz:
         self.is_ranked = game_category == cm.RANKED
         self.players: dict[int, Player] = {}
         self.allowed_players: set[int] = set()
+        self.message_queue: asyncio.Queue[nextcord.Message] = asyncio.Queue()
+        self._hint_timer: asyncio.TimerHandle = None
+        self._drawn_questions: list[tuple[int, str]] = []
+        self._prepared_question: Question = None
+        self._prepared_question_index: int = None
+        self._prefetched_image_path: str = None
+        self._prefetched_image: asyncio.Future[bytes] = None
+        self.recent_messages: deque[nextcord.Message] = deque(
+            maxlen=cm.RECENT_MESSAGES_SIZE
+        )
         self.multilang_plural = "s" if len(self.allowed_langs) >= 2 else ""
 
     def _get_config(self):
@@ -221,8 +284,11 @@ class Quiz:
     def _get_answer_formatter(self):
         return self._config_manager.get_answer_formatter(self._config)
 
+    def _get_mode(self):
+        return self._config[cm.MODE]
+
     def _get_fuzz_threshold(self):
-        return cm.FUZZ_THRESHOLD[self._config[cm.MODE]]
+        return cm.FUZZ_THRESHOLD[self.mode]
 
     def create_settings(self):
         settings = [
@@ -252,55 +318,134 @@ class Quiz:
             self.players[player.id] = Player(player=player, score=1)
 
     def get_ingame_names(self, vnum: int, is_monster: int):
-        if is_monster:
-            names = self._game_names.mob_names
-        else:
-            names = self._game_names.item_names
+        return self._game_names.get_display_names(vnum, is_monster, self.allowed_langs)
 
-        ingame_names: dict[str, str] = names.loc[vnum].to_dict()
+    def get_formatted_names(self, vnum: int, is_monster: int):
+        return self._game_names.get_formatted_names(
+            vnum, is_monster, self.allowed_langs, self.mode, self.answer_formatter
+        )
 
-        for lang, ig_name in ingame_names.items():
-            if ig_name.endswith("+0"):
-                ingame_names[lang] = ig_name[:-2]
+    def _draw_questions(self):
+        random = self._question_sampler.random
+        indices = self._question_sampler.draw(
+            self.year,
+            self.number_of_question,
+            self._question_deck,
+            cm.DECK_RESET_FRACTION,
+        )
+        self._drawn_questions = [
+            (
+                index,
+                self._image_cache.get_path(
+                    self._questions.choose_image_name(index, random)
+                ),
+            )
+            for index in indices
+        ]
 
-            ingame_names[lang] = ingame_names[lang].replace(chr(160), " ").strip()
+    def get_image_path(self, question_index: int) -> str:
+        if question_index >= len(self._drawn_questions):
+            return None
+
+        return self._drawn_questions[question_index][1]
+
+    def _create_question(self, question_index: int):
+        index, image_path = self._drawn_questions[question_index]
+        vnum, is_monster = self._questions.get_key(index)
+
+        return Question(
+            image_path=image_path,
+            allowed_langs=self.allowed_langs,
+            allowed_players=self.allowed_players,
+            max_hint=self.max_hint,
+            time_between_hints=self.time_between_hints,
+            answer_formatter=self.answer_formatter,
+            fuzz_threshold=self.fuzz_threshold,
+            answers=self.get_ingame_names(vnum, is_monster),
+            formatted_answers=self.get_formatted_names(vnum, is_monster),
+            matcher_stats=self._matcher_stats,
+        )
 
-        return ingame_names
+    def prepare_question(self, question_index: int):
+        if question_index >= len(self._drawn_questions) or not self.is_running:
+            return
 
-    def choose_value(self, row: pd.Series) -> str:
-        if pd.isna(row[cm.IMAGE_NAME2]):
-            return row[cm.IMAGE_NAME1]
-        else:
-            return rd.choice(
-                [
-                    row[cm.IMAGE_NAME1],
-                    row[cm.IMAGE_NAME2],
-                ]
-            )
+        if self._prepared_question_index != question_index:
+            self._prepared_question = self._create_question(question_index)
+            self._prepared_question_index = question_index
 
     def get_questions(self):
-        if self.year == -1:
-            questions = self._questions
+        self._draw_questions()
+
+        for question_index in range(len(self._drawn_questions)):
+            self.prepare_question(question_index)
+            question = self._prepared_question
+            self._prepared_question = None
+            self._prepared_question_index = None
+
+            yield question
+
+    def add_message(self, message: nextcord.Message):
+        self.message_queue.put_nowait(message)
+        self.recent_messages.append(message)
+
+    def get_recent_messages(self, after: nextcord.Message, before: datetime):
+        return [
+            message
+            for message in self.recent_messages
+            if message.id > after.id and message.created_at < before
+        ]
+
+    async def get_new_messages(self, after: nextcord.Message):
+        messages = [await self.message_queue.get()]
+
+        while not self.message_queue.empty():
+            messages.append(self.message_queue.get_nowait())
+
+        # None is put in the queue to wake up the quiz without a message.
+        return [
+            message
+            for message in messages
+            if message is not None and message.id > after.id
+        ]
+
+    def _get_packed_image(self, image_path: str) -> memoryview:
+        if self._image_pack is None:
+            return None
+
+        image_name = os.path.basename(image_path)
+
+        if image_name not in self._image_pack:
+            return None
+
+        return self._image_pack.get(image_name)
+
+    def prefetch_image(self, image_path: str):
+        if self._get_packed_image(image_path) is not None:
+            return
+
+        # Only the next image is kept in memory.
+        self._prefetched_image_path = image_path
+        self._prefetched_image = asyncio.get_running_loop().run_in_executor(
+            None, read_bytes, image_path
+        )
+
+    async def get_image(self, image_path: str) -> bytes:
+        packed_image = self._get_packed_image(image_path)
+
+        if packed_image is not None:
+            return packed_image
+
+        if image_path == self._prefetched_image_path:
+            image = self._prefetched_image
+            self._prefetched_image_path = None
+            self._prefetched_image = None
         else:
-            questions = self._questions[self._questions["year"] <= self.year]
-
-        questions = questions.sample(self.number_of_question)
-
-        questions = [
-            Question(
-                image_path=os.path.join(IMAGES_PATH, self.choose_value(question)),
-                allowed_langs=self.allowed_langs,
-                allowed_players=self.allowed_players,
-                max_hint=self.max_hint,
-                time_between_hints=self.time_between_hints,
-                answer_formatter=self.answer_formatter,
-                fuzz_threshold=self.fuzz_threshold,
-                answers=self.get_ingame_names(vnum, question[cm.IS_MONSTER]),
+            image = asyncio.get_running_loop().run_in_executor(
+                None, read_bytes, image_path
             )
-            for vnum, question in questions.iterrows()
-        ]
 
-        return questions
+        return await image
 
     def get_leaderboard(self):
         sorted_players = sorted(
@@ -319,58 +464,111 @@ class Quiz:
 
             yield player
 
-    def stop(self):
-        self.waiting_for_answer = False
-        self.is_running = False
+    def wake_up(self):
+        self.message_queue.put_nowait(None)
 
-    @tasks.loop(seconds=1)
-    async def next_question_timer(
-        self, message: nextcord.Message, embed: nextcord.Embed
-    ):
-        remaining_time = (
-            cm.TIME_BETWEEN_QUESTION - self.next_question_timer.current_loop
+    def start_hint_timer(self, question: Question):
+        self.cancel_hint_timer()
+        self._hint_timer = asyncio.get_running_loop().call_at(
+            question.next_hint_deadline(), self.wake_up
         )
-        plural = "s" * (remaining_time >= 2)
-        embed.set_footer(text=f"Next question in {remaining_time} second{plural}.")
 
-        if not self.is_running:
-            embed.remove_footer()
-            self.next_question_timer.stop()
+    def cancel_hint_timer(self):
+        if self._hint_timer is not None:
+            self._hint_timer.cancel()
+            self._hint_timer = None
 
-        await message.edit(embed=embed)
+    def cancel_question(self):
+        self.waiting_for_answer = False
+        self.cancel_hint_timer()
+        self.wake_up()
 
-        if not remaining_time:
-            self.next_question_timer.stop()
-            embed.remove_footer()
-            await message.edit(embed=embed)
+    def stop(self):
+        self.is_running = False
+        self.cancel_question()
 
 
 class QuizManager:
-    def __init__(self):
-        self._questions = self._get_questions()
-        self.config_manager = cm()
-        self._game_names = GameNames(langs_data=cm.LANGS_DATA)
-        self._check_questions()
-        self.total_questions = self._questions.shape[0]
+    QUESTION_DECKS = "question_decks"
+
+    def __init__(self, persistence: PersistenceService, seed: int = None):
+        self._persistence = persistence
+        self.config_manager = cm(persistence)
+        data_compiler = DataCompiler(langs_data=cm.LANGS_DATA)
+        bundle = data_compiler.get_bundle()
+        self._questions: QuestionTable = bundle[DataCompiler.QUESTIONS]
+        self._question_sampler = QuestionSampler(
+            self._questions.years, DataCompiler.get_bundle_id(bundle), seed
+        )
+        self._game_names = GameNames(load_names=data_compiler.load_names)
+        self._precompute_names()
+        self._game_names.load_langs(sorted(self.config_manager.get_enabled_langs()))
+        self._image_cache = self._get_image_cache()
+        self._image_pack = ImagePack.open(IMAGES_PACK_PATH)
+        self.total_questions = len(self._questions)
+        self.matcher_stats = MatcherStats()
+        self.question_decks = self._load_question_decks()
+        self._persistence.register(
+            self.QUESTION_DECKS,
+            self._snapshot_question_decks,
+            self._write_question_decks,
+        )
         self.quizzes_in_progress: dict[int, Quiz] = {}
 
-    def _get_questions(self):
-        return pd.read_csv(QUESTIONS_PATH, sep=",", index_col=[cm.VNUM])
+    def _precompute_names(self):
+        self._game_names.precompute_names(
+            self._questions.get_keys(), self.config_manager.get_answer_formatters()
+        )
+
+    def _load_question_decks(self) -> dict[int, QuestionDeck]:
+        if not os.path.exists(QUESTION_DECKS_PATH):
+            return {}
 
-    def _check_questions(self):
-        item_vnums = self._game_names.item_names.index
-        mob_vnums = self._game_names.mob_names.index
+        return QuestionDeck.load_all(read_bytes(QUESTION_DECKS_PATH))
 
-        item_questions = self._questions[
-            (self._questions[cm.IS_MONSTER] == 0)
-            & (self._questions.index.isin(item_vnums))
-        ]
-        monster_questions = self._questions[
-            (self._questions[cm.IS_MONSTER] == 1)
-            & (self._questions.index.isin(mob_vnums))
-        ]
+    def _snapshot_question_decks(self) -> bytes:
+        return QuestionDeck.dump_all(self.question_decks)
+
+    @staticmethod
+    def _write_question_decks(data: bytes):
+        temporary_path = QUESTION_DECKS_PATH + ".tmp"
 
-        self._questions = pd.concat([item_questions, monster_questions])
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+
+        os.replace(temporary_path, QUESTION_DECKS_PATH)
+
+    def _get_question_deck(self, guild_id: int) -> QuestionDeck:
+        if guild_id not in self.question_decks:
+            self.question_decks[guild_id] = QuestionDeck(
+                bundle_id=self._question_sampler.bundle_id,
+                year=QuestionSampler.ALL_YEARS,
+                pool_size=0,
+            )
+
+        return self.question_decks[guild_id]
+
+    def _get_image_names(self) -> list[str]:
+        return self._questions.get_image_names()
+
+    def _get_image_cache(self):
+        image_cache = ImageCache(
+            images_path=IMAGES_PATH,
+            cache_path=IMAGES_CACHE_PATH,
+            max_dimension=cm.IMAGE_MAX_DIMENSION,
+            image_format=cm.IMAGE_FORMAT,
+        )
+        image_cache.build(self._get_image_names())
+
+        return image_cache
+
+    def get_image_paths(self):
+        image_paths = {
+            self._image_cache.get_path(image_name)
+            for image_name in self._get_image_names()
+        }
+
+        return sorted(path for path in image_paths if os.path.exists(path))
 
     def has_active_quiz(self, channel_id: int):
         if channel_id not in self.quizzes_in_progress:
@@ -381,6 +579,14 @@ class QuizManager:
     def get_quiz(self, channel_id: int):
         return self.quizzes_in_progress[channel_id]
 
+    def _unload_unused_langs(self):
+        resident_langs = self.config_manager.get_enabled_langs()
+
+        for quiz in self.quizzes_in_progress.values():
+            resident_langs.update(quiz.allowed_langs)
+
+        self._game_names.unload_unused_langs(resident_langs, cm.LANG_UNLOAD_TIME)
+
     def start_quiz(
         self,
         guild_id: int,
@@ -390,11 +596,17 @@ class QuizManager:
         game_category: str,
         year: int,
     ):
+        self._unload_unused_langs()
         new_quiz = Quiz(
             config_manager=self.config_manager,
             guild_id=guild_id,
             questions=self._questions,
+            question_sampler=self._question_sampler,
+            question_deck=self._get_question_deck(guild_id),
             game_names=self._game_names,
+            image_cache=self._image_cache,
+            image_pack=self._image_pack,
+            matcher_stats=self.matcher_stats,
             number_of_question=number_of_question,
             config_name=config_name,
             game_category=game_category,
@@ -406,109 +618,124 @@ class QuizManager:
     def end_quiz(self, channel_id: int):
         self.quizzes_in_progress[channel_id].stop()
         del self.quizzes_in_progress[channel_id]
+        self._persistence.mark_dirty(self.QUESTION_DECKS)
+
+    def close(self):
+        self.config_manager.close()
 
 
 class EloManager:
-    ELO = "elo"
-    NAME = "name"
+    RATINGS = "ratings"
     DEFAULT_ELO = 1000
     LEADERBOARD_MAX_DISPLAY = 20
 
-    def __init__(self):
-        self._data = self._get_data()
+    def __init__(self, persistence: PersistenceService):
+        self._store = EloStore()
+        self._ratings = self._load_ratings()
+        self._indices = self._create_indices()
+        self._versions: dict[int, int] = {}
+        self._pending_ratings: dict[tuple[int, int], tuple[str, int]] = {}
+        self._persistence = persistence
+        self._persistence.register(
+            self.RATINGS,
+            self._snapshot_ratings,
+            self._store.update_ratings,
+            self._restore_ratings,
+        )
 
-    def _get_data(self) -> dict:
-        if os.path.exists(LEADERBOARD_PATH):
-            return open_json(LEADERBOARD_PATH)
+    def _load_ratings(self) -> dict[int, dict[int, tuple[str, int]]]:
+        ratings = {}
 
-        return {}
+        for guild_id, player_id, name, elo in self._store.get_all_ratings():
+            ratings.setdefault(guild_id, {})[player_id] = (name, elo)
 
-    def _save_data(self):
-        with open(LEADERBOARD_PATH, "w") as file:
-            file.write(json.dumps(self._data, indent=4))
+        return ratings
 
-    def get_elo(self, guild_id: int, player_id: int, player_name=None):
-        if not guild_id in self._data:
-            self._data[guild_id] = {}
+    def _create_indices(self) -> dict[int, RatingIndex]:
+        indices = {}
 
-        if not player_id in self._data[guild_id]:
-            self._data[guild_id][player_id] = self.default_info(player_name)
-            return self.DEFAULT_ELO
+        for guild_id, players in self._ratings.items():
+            index = indices[guild_id] = RatingIndex()
 
-        if self.ELO in self._data[guild_id][player_id]:
-            return self._data[guild_id][player_id][self.ELO]
+            for player_id, (_, elo) in players.items():
+                index.update(player_id, elo)
 
-        return self.DEFAULT_ELO
+        return indices
+
+    def _snapshot_ratings(self):
+        pending_ratings = self._pending_ratings
+        self._pending_ratings = {}
 
-    def default_info(self, player_name: str):
-        return {self.NAME: player_name}
+        return [
+            (guild_id, player_id, name, elo)
+            for (guild_id, player_id), (name, elo) in pending_ratings.items()
+        ]
 
-    def _update(self, guild_id, player_id, new_elo: int):
-        self._data[guild_id][player_id][self.ELO] = new_elo
+    def _restore_ratings(self, ratings: list[tuple[int, int, str, int]]):
+        # Ratings changed since the failed write are newer and kept.
+        for guild_id, player_id, name, elo in ratings:
+            self._pending_ratings.setdefault((guild_id, player_id), (name, elo))
+
+    def close(self):
+        self._store.close()
+
+    def get_elo(self, guild_id: int, player_id: int):
+        if player_id in self._ratings.get(guild_id, {}):
+            return self._ratings[guild_id][player_id][1]
+
+        return self.DEFAULT_ELO
+
+    def _update(self, guild_id: int, player_id: int, name: str, new_elo: int):
+        self._ratings.setdefault(guild_id, {})[player_id] = (name, new_elo)
+        self._indices.setdefault(guild_id, RatingIndex()).update(player_id, new_elo)
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+        self._pending_ratings[(guild_id, player_id)] = (name, new_elo)
 
     def update_elo_ratings(self, quiz: Quiz):
         if len(quiz.allowed_players) == 1:
             return
 
-        current_elo = {
-            player_id: player.elo for player_id, player in quiz.players.items()
-        }
-        players_items = quiz.players.items()
-
-        for player_id, player in players_items:
-            player_elo = current_elo[player_id]
-            elo_augmentation = sum(
-                elo_formula(
-                    player_elo, player.score, current_elo[opponent_id], opponent.score
-                )
-                for opponent_id, opponent in players_items
-                if player_id != opponent_id
-            )
-            quiz.players[player_id].elo_augmentation = elo_augmentation
-            self._update(quiz.guild_id, player_id, player_elo + elo_augmentation)
-
-        self._save_data()
-
-    def get_leaderboard(self, guild_id: int):
-        players_score: dict[int, dict] = self._data[guild_id]
-        valid_scores = (
-            (player_score[self.NAME], player_score[self.ELO])
-            for player_score in players_score.values()
-            if self.ELO in player_score
+        players = list(quiz.players.values())
+        augmentations = elo_augmentations(
+            [player.elo for player in players], [player.score for player in players]
         )
-        sorted_players = sorted(valid_scores, key=lambda score: score[1], reverse=True)
 
-        current_rank = 1
-        current_score = None
+        for player, elo_augmentation in zip(players, augmentations):
+            player.elo_augmentation = elo_augmentation
+            self._update(
+                quiz.guild_id,
+                player.id,
+                player.user_name,
+                player.elo + elo_augmentation,
+            )
 
-        for index, (player_name, score) in enumerate(sorted_players, start=1):
-            if index == self.LEADERBOARD_MAX_DISPLAY + 1:
-                break
+        self._persistence.mark_dirty(self.RATINGS)
 
-            if score != current_score:
-                current_rank = index
-                current_score = score
+    def export_leaderboard(self) -> dict[int, dict[int, dict]]:
+        return {
+            guild_id: {
+                player_id: {EloStore.NAME: name, EloStore.ELO: elo}
+                for player_id, (name, elo) in players.items()
+            }
+            for guild_id, players in self._ratings.items()
+        }
 
-            yield ((convert_rank(current_rank), player_name, score))
+    def get_version(self, guild_id: int) -> int:
+        return self._versions.get(guild_id, 0)
 
-    def get_player_ranking(self, guild_id: int, user_name: str):
-        players_score: dict[int, dict] = self._data[guild_id]
-        valid_scores = (
-            (player_score[self.NAME], player_score[self.ELO])
-            for player_score in players_score.values()
-            if self.ELO in player_score
-        )
-        sorted_players = sorted(valid_scores, key=lambda score: score[1], reverse=True)
+    def get_leaderboard(self, guild_id: int):
+        players = self._ratings[guild_id]
+        top_players = self._indices[guild_id].get_top(self.LEADERBOARD_MAX_DISPLAY)
 
-        current_rank = 1
-        current_score = None
+        return [
+            (convert_rank(rank), player_id, players[player_id][0], elo)
+            for rank, player_id, elo in top_players
+        ]
 
-        for index, (player_name, score) in enumerate(sorted_players):
-            if score != current_score:
-                current_rank = index + 1
-                current_score = score
+    def get_player_ranking(self, guild_id: int, player_id: int):
+        index = self._indices[guild_id]
 
-            if player_name == user_name:
-                return score, current_rank, len(sorted_players)
+        if player_id not in index:
+            return None
 
-        return None
+        return index.get_elo(player_id), index.get_rank(player_id), len(index)
@@ -0,0 +1,46 @@
+from bisect import bisect_left, insort
+
+
+class RatingIndex:
+    def __init__(self):
+        # Sorted by decreasing elo, then by player id.
+        self._keys: list[tuple[int, int]] = []
+        self._elos: dict[int, int] = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, player_id: int):
+        return player_id in self._elos
+
+    def update(self, player_id: int, elo: int):
+        old_elo = self._elos.get(player_id)
+
+        if old_elo is not None:
+            del self._keys[bisect_left(self._keys, (-old_elo, player_id))]
+
+        insort(self._keys, (-elo, player_id))
+        self._elos[player_id] = elo
+
+    def get_elo(self, player_id: int) -> int:
+        return self._elos.get(player_id)
+
+    def get_rank(self, player_id: int) -> int:
+        elo = self._elos.get(player_id)
+
+        if elo is None:
+            return None
+
+        # Players with the same elo share the rank of the first of them.
+        return bisect_left(self._keys, (-elo,)) + 1
+
+    def get_top(self, k: int):
+        current_rank = 1
+        current_elo = None
+
+        for index, (negative_elo, player_id) in enumerate(self._keys[:k], start=1):
+            if -negative_elo != current_elo:
+                current_rank = index
+                current_elo = -negative_elo
+
+            yield current_rank, player_id, current_elo
@@ -1,6 +1,8 @@
 import json
 from datetime import datetime, timezone
 
+import numpy as np
+
 
 def json_converter(obj):
     if isinstance(obj, str):
@@ -36,6 +38,36 @@ def elo_formula(player_elo, player_score, opponent_elo, opponent_score):
     return round(20 * (W_coeff - p_coeff))
 
 
+def elo_augmentations(elos: list[int], scores: list[int]) -> list[int]:
+    if not elos:
+        return []
+
+    elos = np.asarray(elos, dtype=np.int64)
+    scores = np.asarray(scores)
+
+    score_differences = np.minimum(400, elos[:, None] - elos[None, :])
+    lowest_difference = int(score_differences.min())
+    # Computed like elo_formula, once per possible difference, to get the same floats.
+    p_coeffs = np.array(
+        [
+            1 / (1 + 10 ** (-difference / 400))
+            for difference in range(lowest_difference, 401)
+        ]
+    )
+    p_coeff = p_coeffs[score_differences - lowest_difference]
+
+    W_coeff = np.where(
+        scores[:, None] > scores[None, :],
+        1.0,
+        np.where(scores[:, None] < scores[None, :], 0.0, 0.5),
+    )
+    # np.rint rounds half to even like round.
+    augmentations = np.rint(20 * (W_coeff - p_coeff)).astype(np.int64)
+    np.fill_diagonal(augmentations, 0)
+
+    return augmentations.sum(axis=1).tolist()
+
+
 def convert_rank(rank: int):
     if rank == 1:
         return "🥇"
@@ -50,5 +82,10 @@ def open_json(path: str) -> dict:
     with open(path, "r", encoding="utf-8") as config_file:
         return json.load(config_file, object_hook=json_converter)
 
+def read_bytes(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
 def get_current_time():
     return datetime.now(timezone.utc)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import nextcord
-from nextcord.ext import tasks
 
+from src.countdown import Countdown, CountdownTicker
 from src.quiz_manager import Quiz, EloManager
 from src.config import ConfigurationManager as cm
 
@@ -12,36 +12,37 @@ class RegistrationButton(nextcord.ui.View):
     def __init__(
         self,
         elo_manager: EloManager,
+        countdown_ticker: CountdownTicker,
         quiz: Quiz,
         embed: nextcord.Embed,
         registration_time: int,
     ):
         super().__init__()
         self.elo_manager = elo_manager
+        self.countdown_ticker = countdown_ticker
         self.quiz = quiz
         self.embed = embed
         self.registration_time = registration_time
         self.embed_value = ""
 
     async def update(self, message: nextcord.Message):
-        await self.registration_timer.start(message)
-
-    @tasks.loop(seconds=1)
-    async def registration_timer(self, message: nextcord.Message):
-        remaining_time = self.registration_time - self.registration_timer.current_loop
-        plural = "s" * (remaining_time >= 2)
-
-        self.embed.set_footer(
-            text=self.MESSAGE_OPEN.format(remaining_time=remaining_time, plural=plural)
+        await self.countdown_ticker.run(
+            Countdown(
+                message=message,
+                embed=self.embed,
+                duration=self.registration_time,
+                footer=self.MESSAGE_OPEN,
+                is_running=lambda: self.quiz.is_running,
+                on_finish=self.close_registrations,
+                view=self,
+            )
         )
-        await message.edit(embed=self.embed, view=self)
 
-        if not remaining_time or not self.quiz.is_running:
-            button: nextcord.Button = self.children[0]
-            button.disabled = True
-            self.embed.set_footer(text=self.MESSAGE_CLOSE)
-            await message.edit(embed=self.embed, view=self)
-            self.registration_timer.stop()
+    async def close_registrations(self, countdown: Countdown):
+        button: nextcord.Button = self.children[0]
+        button.disabled = True
+        self.embed.set_footer(text=self.MESSAGE_CLOSE)
+        await countdown.edit()
 
     @nextcord.ui.button(
         label="Registration", style=nextcord.ButtonStyle.success, emoji="🎟️"
@@ -53,9 +54,7 @@ class RegistrationButton(nextcord.ui.View):
             await interaction.send("You are already registered. Stop clicking :face_with_symbols_over_mouth:", ephemeral=True)
             return
 
-        player_elo = self.elo_manager.get_elo(
-            interaction.guild_id, player.id, player.name
-        )
+        player_elo = self.elo_manager.get_elo(interaction.guild_id, player.id)
         player = self.quiz.add_new_player(player, player_elo)
 
         self.embed_value += f"\n- {player.register_display()}"
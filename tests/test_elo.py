@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from src.utils.utils import elo_augmentations, elo_formula
+
+
+def pairwise_augmentations(elos: list[int], scores: list[int]) -> list[int]:
+    return [
+        sum(
+            elo_formula(player_elo, player_score, opponent_elo, opponent_score)
+            for opponent, (opponent_elo, opponent_score) in enumerate(zip(elos, scores))
+            if opponent != player
+        )
+        for player, (player_elo, player_score) in enumerate(zip(elos, scores))
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_lobbies(seed: int):
+    rd = random.Random(seed)
+
+    for _ in range(200):
+        number_of_players = rd.randint(1, 12)
+        center = rd.randint(0, 3000)
+        spread = rd.choice([0, 5, 50, 400, 1200, 5000])
+        elos = [center + rd.randint(-spread, spread) for _ in range(number_of_players)]
+        # Few possible scores to get ties.
+        max_score = rd.choice([0, 1, 3, 40])
+        scores = [rd.randint(0, max_score) for _ in range(number_of_players)]
+
+        assert elo_augmentations(elos, scores) == pairwise_augmentations(elos, scores)
+
+
+def test_empty_lobby():
+    assert elo_augmentations([], []) == []
+
+
+@pytest.mark.parametrize("elo", [0, 1000, 5000])
+def test_one_player_lobby(elo: int):
+    assert elo_augmentations([elo], [3]) == [0]
+
+
+@pytest.mark.parametrize("scores", [[1, 0], [0, 1], [2, 2]])
+def test_every_elo_difference(scores: list[int]):
+    # Goes past the 400 cap on both sides and through every rounding half.
+    for difference in range(-1000, 1001):
+        elos = [1000 + difference, 1000]
+
+        assert elo_augmentations(elos, scores) == pairwise_augmentations(elos, scores)
+
+
+def test_tied_lobby_with_elo_gaps():
+    elos = [0, 300, 1000, 1400, 2500]
+    scores = [5] * len(elos)
+
+    assert elo_augmentations(elos, scores) == pairwise_augmentations(elos, scores)